@@ -1500,22 +1500,23 @@ def start_automation_process(process_type, button_ref, process_ref_name):
         return
     
     try:
+        # Runners aren't daemonic so they can start a vision worker, closing the GUI terminates them
         if process_type == "Mirror Dungeon":
             from src import compiled_runner
             count = int(entry.get())
-            new_process = Process(target=compiled_runner.main, args=(count, shared_vars), daemon=True)
+            new_process = Process(target=compiled_runner.main, args=(count, shared_vars))
         elif process_type == "Exp":
             from src import exp_runner
             runs = int(exp_entry.get())
             stage = exp_stage_var.get()
             if stage != "latest":
                 stage = int(stage)
-            new_process = Process(target=exp_runner.main, args=(runs, stage, shared_vars), daemon=True)
+            new_process = Process(target=exp_runner.main, args=(runs, stage, shared_vars))
         elif process_type == "Threads":
             from src import threads_runner
             runs = int(threads_entry.get())
             difficulty = threads_difficulty_var.get()
-            new_process = Process(target=threads_runner.main, args=(runs, difficulty, shared_vars), daemon=True)
+            new_process = Process(target=threads_runner.main, args=(runs, difficulty, shared_vars))
         
         new_process.start()
         
@@ -1723,24 +1724,25 @@ def run_next_chain_step():
         save_selected_statuses()
     
     try:
+        # Runners aren't daemonic so they can start a vision worker, closing the GUI terminates them
         if automation_type == "Threads":
             from src import threads_runner
             difficulty = threads_difficulty_var.get()
             global threads_process
-            threads_process = Process(target=threads_runner.main, args=(runs, difficulty, shared_vars), daemon=True)
+            threads_process = Process(target=threads_runner.main, args=(runs, difficulty, shared_vars))
             threads_process.start()
             
         elif automation_type == "Exp":
             from src import exp_runner
             stage = exp_stage_var.get()
             global exp_process
-            exp_process = Process(target=exp_runner.main, args=(runs, stage, shared_vars), daemon=True)
+            exp_process = Process(target=exp_runner.main, args=(runs, stage, shared_vars))
             exp_process.start()
             
         elif automation_type == "Mirror":
             from src import compiled_runner
             global process
-            process = Process(target=compiled_runner.main, args=(runs, shared_vars), daemon=True)
+            process = Process(target=compiled_runner.main, args=(runs, shared_vars))
             process.start()
             
         elif automation_type == "GameLauncher":
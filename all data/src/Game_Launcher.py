@@ -54,8 +54,7 @@ def launch_game(appid):
 
 def launch_limbussy():
     launch_game("1973530")
-    while not common.element_exist("pictures/CustomAdded1080p/launch/Clear_All_Caches.png"):
-        common.sleep(1)
+    common.wait_for(any_of=["pictures/CustomAdded1080p/launch/Clear_All_Caches.png"])
     while common.element_exist("pictures/CustomAdded1080p/launch/Clear_All_Caches.png"):
         common.mouse_move_click(*common.scale_coordinates_1080p(960, 540))
         common.click_matching("pictures/general/beeg_confirm.png", recursive=False)
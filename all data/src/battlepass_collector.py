@@ -62,12 +62,12 @@ def main():
 
     claim_rewards()
     common.key_press("esc")
-    while common.element_exist("pictures/CustomAdded1080p/battlepass/pass_missions.png", x1=common.scale_x_1080p(450), y1=common.scale_y_1080p(65), x2=common.scale_x_1080p(640), y2=common.scale_y_1080p(100)):
+    while common.element_exist("pictures/CustomAdded1080p/battlepass/pass_missions.png"):
         common.key_press("esc")
 
 def claim_missions():
     while True:
-        matches = common.ifexist_match("pictures/CustomAdded1080p/battlepass/notification.png", x1=common.scale_x_1080p(985), y1=common.scale_y_1080p(270), x2=common.scale_x_1080p(1050), y2=common.scale_y_1080p(850))
+        matches = common.ifexist_match("pictures/CustomAdded1080p/battlepass/notification.png")
         if not matches:
             break
         for x, y in matches:
@@ -8,7 +8,10 @@ import secrets
 import platform
 import threading
 import inspect
+import weakref
 from functools import partial
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import wintypes
 import cv2
 import numpy as np
@@ -17,6 +20,8 @@ from mss import mss
 from mss.tools import to_png
 from PIL import ImageGrab
 import shared_vars
+import template_pack
+import vision_utils
 
 pyautogui.FAILSAFE = False
 pyautogui.PAUSE = 0.05
@@ -149,33 +154,96 @@ def initialize_async_logging():
             return False
     return False
 
+# ==================== CAPTURE SESSION ====================
+
+class _CaptureSession(threading.local):
+    """Per-thread MSS grabber that stays open between captures.
+
+    MSS keeps OS handles (device contexts, bitmaps) that must not be shared
+    between threads, so every thread gets its own lazily created instance.
+    """
+
+    def __init__(self):
+        self.sct = None
+
+    def get(self):
+        """Return the open grabber for this thread, creating it on first use"""
+        if self.sct is None:
+            self.sct = mss()
+        return self.sct
+
+    def close(self):
+        """Release the grabber of this thread, next capture will reopen it"""
+        if self.sct is not None:
+            try:
+                self.sct.close()
+            except Exception as e:
+                logger.debug(f"Error closing capture session: {e}")
+            self.sct = None
+
+_capture_session = _CaptureSession()
+_capture_session_epoch = 0  # Bumped to make every thread reopen its grabber
+
+def get_capture_session():
+    """Get the long-lived MSS grabber of the current thread"""
+    if getattr(_capture_session, 'epoch', None) != _capture_session_epoch:
+        _capture_session.close()
+        _capture_session.epoch = _capture_session_epoch
+    return _capture_session.get()
+
+def reset_capture_sessions():
+    """Force all threads to reopen their grabber, e.g. after monitor layout changed"""
+    global _capture_session_epoch
+    _capture_session_epoch += 1
+    _capture_session.close()
+
+# ==================== MONITOR GEOMETRY ====================
+
+_monitor_geometry = ()  # Copies of the MSS monitor dicts, index 0 is the whole desktop
+_monitor_geometry_lock = threading.Lock()
+
+def refresh_monitor_geometry():
+    """Re-read the monitor layout from the OS, call after the display configuration changed"""
+    global _monitor_geometry
+    monitors = tuple(dict(monitor) for monitor in get_capture_session().monitors)
+    with _monitor_geometry_lock:
+        _monitor_geometry = monitors
+    logger.debug(f"Monitor geometry refreshed: {len(monitors) - 1} monitor(s)")
+    return monitors
+
+def get_monitor_geometry():
+    """Get the cached monitor layout, read once instead of querying the OS on every input call"""
+    monitors = _monitor_geometry
+    if not monitors:
+        monitors = refresh_monitor_geometry()
+    return monitors
+
 def detect_monitor_resolution():
     """Detect the actual resolution of the game monitor"""
     global MONITOR_WIDTH, MONITOR_HEIGHT, IS_NON_STANDARD_RATIO, EXPECTED_WIDTH, EXPECTED_HEIGHT
     
-    with mss() as sct:
-        # Use monitor 1 as default if shared_vars.game_monitor doesn't exist yet
-        monitor_index = getattr(shared_vars, 'game_monitor', 1)
-        monitor = sct.monitors[monitor_index]
-        MONITOR_WIDTH = monitor['width']
-        MONITOR_HEIGHT = monitor['height']
-        
-        logger.info(f"Detected montior size: {MONITOR_WIDTH}x{MONITOR_HEIGHT}")
+    # Use monitor 1 as default if shared_vars.game_monitor doesn't exist yet
+    monitor_index = getattr(shared_vars, 'game_monitor', 1)
+    monitor = refresh_monitor_geometry()[monitor_index]
+    MONITOR_WIDTH = monitor['width']
+    MONITOR_HEIGHT = monitor['height']
+    
+    logger.info(f"Detected montior size: {MONITOR_WIDTH}x{MONITOR_HEIGHT}")
 
-        # Calculate aspect ratio
-        aspect_ratio = MONITOR_WIDTH / MONITOR_HEIGHT
-        IS_NON_STANDARD_RATIO = not(abs(aspect_ratio - REFERENCE_ASPECT_RATIO) < 0.0001)
+    # Calculate aspect ratio
+    aspect_ratio = MONITOR_WIDTH / MONITOR_HEIGHT
+    IS_NON_STANDARD_RATIO = not(abs(aspect_ratio - REFERENCE_ASPECT_RATIO) < 0.0001)
 
-        EXPECTED_WIDTH = MONITOR_WIDTH
-        EXPECTED_HEIGHT = MONITOR_HEIGHT
-        if IS_NON_STANDARD_RATIO:
-            if aspect_ratio > REFERENCE_ASPECT_RATIO:
-                EXPECTED_WIDTH = round(MONITOR_HEIGHT * REFERENCE_ASPECT_RATIO)
-            else:
-                EXPECTED_HEIGHT = round(MONITOR_WIDTH / REFERENCE_ASPECT_RATIO)
-            logger.info(f"Non-standard monitor ratio detected (expect {EXPECTED_WIDTH}x{EXPECTED_HEIGHT} instead)")
+    EXPECTED_WIDTH = MONITOR_WIDTH
+    EXPECTED_HEIGHT = MONITOR_HEIGHT
+    if IS_NON_STANDARD_RATIO:
+        if aspect_ratio > REFERENCE_ASPECT_RATIO:
+            EXPECTED_WIDTH = round(MONITOR_HEIGHT * REFERENCE_ASPECT_RATIO)
+        else:
+            EXPECTED_HEIGHT = round(MONITOR_WIDTH / REFERENCE_ASPECT_RATIO)
+        logger.info(f"Non-standard monitor ratio detected (expect {EXPECTED_WIDTH}x{EXPECTED_HEIGHT} instead)")
 
-        return MONITOR_WIDTH, MONITOR_HEIGHT
+    return MONITOR_WIDTH, MONITOR_HEIGHT
 
 # Initialize monitor resolution at module load time
 detect_monitor_resolution()
@@ -191,21 +259,20 @@ def sleep(x):
 def mouse_scroll(amount):
     """Scroll mouse wheel"""
     pyautogui.scroll(amount)
+    invalidate_frame_cache()
 
 def _validate_monitor_index(monitor_index, fallback=1):
     """Validate and return a safe monitor index"""
-    with mss() as sct:
-        if monitor_index >= len(sct.monitors):
-            logger.warning(f"Monitor index {monitor_index} out of range")
-            return fallback
-        return monitor_index
+    if monitor_index >= len(get_monitor_geometry()):
+        logger.warning(f"Monitor index {monitor_index} out of range")
+        return fallback
+    return monitor_index
 
 def get_monitor_info(monitor_index=None):
     """Get information about the specified monitor or the game monitor"""
-    with mss() as sct:
-        mon_idx = monitor_index if monitor_index is not None else shared_vars.game_monitor
-        mon_idx = _validate_monitor_index(mon_idx)
-        return sct.monitors[mon_idx]
+    mon_idx = monitor_index if monitor_index is not None else shared_vars.game_monitor
+    mon_idx = _validate_monitor_index(mon_idx)
+    return get_monitor_geometry()[mon_idx]
 
 def get_MonCords(x, y):
     """Convert local coordinates to global monitor coordinates"""
@@ -216,6 +283,7 @@ def mouse_move(x, y):
     """Moves the mouse to the X,Y coordinate specified on the game monitor"""
     real_x, real_y = get_MonCords(x, y)
     pyautogui.moveTo(real_x, real_y)
+    invalidate_frame_cache()
 
 def mouse_click():
     """Performs a left click on the current position"""
@@ -223,20 +291,24 @@ def mouse_click():
     current_pos = pyautogui.position()
     logger.debug(f"Mouse click at ({current_pos.x}, {current_pos.y}) - {caller_info}", dirty=True)
     pyautogui.click()
+    invalidate_frame_cache()
 
 def mouse_hold():
     """Hold down mouse button for 2 seconds"""
     pyautogui.mouseDown()
     sleep(2)
     pyautogui.mouseUp()
+    invalidate_frame_cache()
 
 def mouse_down():
     """Press down mouse button"""
     pyautogui.mouseDown()
+    invalidate_frame_cache()
 
 def mouse_up():
     """Release mouse button"""
     pyautogui.mouseUp()
+    invalidate_frame_cache()
 
 def mouse_move_click(x, y, log_click=True):
     """Moves the mouse to the X,Y coordinate specified and performs a left click"""
@@ -245,6 +317,7 @@ def mouse_move_click(x, y, log_click=True):
         logger.debug(f"Mouse move and click to ({x}, {y}) - {caller_info}", dirty=True)
     mouse_move(x, y)
     pyautogui.click()
+    invalidate_frame_cache()
 
 def mouse_drag(x, y, seconds=1):
     """Drag from current position to the specified coords on the game monitor"""
@@ -252,28 +325,475 @@ def mouse_drag(x, y, seconds=1):
     logger.debug(f"Mouse drag to ({x}, {y}) over {seconds}s - {caller_info}", dirty=True)
     real_x, real_y = get_MonCords(x, y)
     pyautogui.dragTo(real_x, real_y, seconds, button='left')
+    invalidate_frame_cache()
 
 def key_press(Key, presses=1):
     """Presses the specified key X amount of times"""
     pyautogui.press(Key, presses)
+    invalidate_frame_cache()
+
+def _grab_bgra(mon_idx):
+    """Grab a monitor and wrap the raw BGRA bytes of MSS as an array without copying them"""
+    try:
+        sct = get_capture_session()
+        screenshot = sct.grab(get_monitor_geometry()[mon_idx])
+    except Exception as e:
+        # Handles can go stale (display sleep, resolution change), reopen once and retry
+        logger.warning(f"Screen capture failed, reopening capture session: {e}")
+        _capture_session.close()
+        sct = get_capture_session()
+        # The failure may come from a display change, so re-read where the monitors are
+        screenshot = sct.grab(refresh_monitor_geometry()[_validate_monitor_index(mon_idx)])
+    return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
 
 def capture_screen(monitor_index=None):
     """Captures the specified monitor screen using MSS and converts it to a numpy array for CV2."""
-    with mss() as sct:
-        # Use specified monitor or default game monitor
-        mon_idx = monitor_index if monitor_index is not None else shared_vars.game_monitor
-        mon_idx = _validate_monitor_index(mon_idx)
-            
-        monitor = sct.monitors[mon_idx]
+    # Use specified monitor or default game monitor
+    mon_idx = monitor_index if monitor_index is not None else shared_vars.game_monitor
+    mon_idx = _validate_monitor_index(mon_idx)
+    bgra = _grab_bgra(mon_idx)
+    
+    # Convert the color from BGRA to BGR for OpenCV compatibility
+    return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR)
+
+# ==================== FRAME BUFFER POOL ====================
+
+FRAME_BUFFER_POOL_SIZE = 4  # Spare BGR and grey images kept for new captures
+
+class _FrameBufferPool:
+    """Recycles the images of frames nothing uses anymore.
+    
+    The pool owns the memory and hands out each image through a memoryview, so every
+    view or slice numpy derives from it keeps that image object alive as its base.
+    A weak reference to the image therefore tells exactly when nothing reads the
+    memory anymore. Leases are handed back when their Frame is garbage collected but
+    the memory is only reused once that reference is dead, so an image some thread
+    still reads is never overwritten by a newer capture.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._free = []
+        self._lock = threading.Lock()
+        self.allocated = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def acquire(self, shape):
+        """Get a free uint8 image of the given shape, allocating one if none is free.
+        
+        Returns:
+            (image, lease) where the lease goes back through release() once the image's frame is collected
+        """
+        buffer = None
+        with self._lock:
+            for i in range(len(self._free)):
+                candidate, image_ref = self._free[i]
+                if candidate.shape == shape and image_ref() is None:
+                    buffer = self._free.pop(i)[0]
+                    self.reused += 1
+                    break
+            else:
+                self.allocated += 1
+        if buffer is None:
+            buffer = np.empty(shape, np.uint8)
+        # Not an ndarray base, so views of the image point at the image instead of the buffer
+        image = np.asarray(memoryview(buffer))
+        return image, (buffer, weakref.ref(image))
+
+    def release(self, leases):
+        """Take back the leases of a collected frame, emptying the list"""
+        with self._lock:
+            # The frame's own attributes still point at the images here, so liveness is checked on reuse instead
+            while leases:
+                self._free.append(leases.pop())
+            while len(self._free) > self.size:
+                self._free.pop(0)
+                self.discarded += 1
+
+    def stats(self):
+        """Allocation counters of the pool"""
+        with self._lock:
+            return {"allocated": self.allocated, "reused": self.reused,
+                    "discarded": self.discarded, "free": len(self._free)}
+
+_frame_buffer_pool = _FrameBufferPool(FRAME_BUFFER_POOL_SIZE)
+
+def get_frame_buffer_stats():
+    """Get how often frame images were allocated, reused from the pool or dropped while still referenced"""
+    return _frame_buffer_pool.stats()
+
+# ==================== FRAME CACHE ====================
+
+FRAME_CACHE_MAX_AGE = 0.05  # Seconds since its last use a captured frame keeps serving template matches
+FRAME_CACHE_MAX_LIFETIME = 0.25  # Seconds after capture a frame is replaced even if it's still in use
+FRAME_MEMO_MAX_BYTES = 64 * 1024 * 1024  # Score maps and detections remembered per frame
+
+class Frame:
+    """Screenshot of the game monitor shared by every match of one decision tick.
+
+    Frames made from a raw BGRA grab convert colours lazily: a match limited to a
+    region converts only that region, the whole screen is converted once some
+    match needs all of it. Images must be treated as read-only since other
+    matches may be using them.
+    """
+
+    def __init__(self, image, generation, monitor_index, pooled=False, timestamp=None, bgra=None):
+        """
+        Args:
+            image: BGR screenshot, None to convert it from bgra when first needed
+            pooled: Converted images come from the frame buffer pool and go back to it once the frame is collected
+            timestamp: time.monotonic() when the grab started, defaults to now
+            bgra: Raw grab the BGR and grey images are converted from
+        """
+        self._image = image
+        self._bgra = bgra
+        self._convert_lock = threading.Lock()
+        self.shape = (image if image is not None else bgra).shape[:2]  # (height, width) of the screen
+        self.generation = generation
+        self.monitor_index = monitor_index
+        self.timestamp = timestamp if timestamp is not None else time.monotonic()
+        self.last_used = self.timestamp
+        self._gray = None
+        self._pyramid = {}
+        self._thumbnail = None
+        self._memo = OrderedDict()  # Score maps and detections computed on this frame
+        self._memo_bytes = 0
+        self._memo_lock = threading.Lock()
+        self._buffers = None
+        if pooled:
+            self._buffers = []  # Pool leases of the converted images
+            # The finalizer must not reference the frame itself, only its list of leases
+            weakref.finalize(self, _frame_buffer_pool.release, self._buffers)
+
+    def _convert(self, source, code, shape):
+        """Convert the whole screen into a pooled image when the frame is pooled"""
+        if self._buffers is None:
+            return cv2.cvtColor(source, code)
+        image, lease = _frame_buffer_pool.acquire(shape)
+        converted = cv2.cvtColor(source, code, dst=image)
+        self._buffers.append(lease)
+        return converted
+
+    @property
+    def image(self):
+        """BGR version of the frame, converted once on first use"""
+        if self._image is None:
+            with self._convert_lock:
+                if self._image is None:
+                    self._image = self._convert(self._bgra, cv2.COLOR_BGRA2BGR, (*self.shape, 3))
+                    if self._gray is not None:
+                        self._bgra = None  # Everything can be derived from the converted images now
+        return self._image
+
+    @property
+    def gray(self):
+        """Greyscale version of the frame, converted once on first use"""
+        if self._gray is None:
+            with self._convert_lock:
+                if self._gray is None:
+                    if self._image is not None:
+                        self._gray = self._convert(self._image, cv2.COLOR_BGR2GRAY, self.shape)
+                        self._bgra = None
+                    else:
+                        self._gray = self._convert(self._bgra, cv2.COLOR_BGRA2GRAY, self.shape)
+        return self._gray
+
+    @property
+    def pixels(self):
+        """Raw BGRA grab while it's kept, the BGR image otherwise, for reading channels of single pixels"""
+        with self._convert_lock:
+            bgra, image = self._bgra, self._image
+        return bgra if bgra is not None else image if image is not None else self.image
+
+    def region(self, grayscale, x1=None, y1=None, x2=None, y2=None):
+        """Part of the frame in BGR or grey, converting only that part if the whole screen wasn't converted yet.
+        
+        Returns:
+            (region, offset_x, offset_y) like _crop_region
+        """
+        with self._convert_lock:
+            full = self._gray if grayscale else self._image
+            image, bgra = self._image, self._bgra
+        if full is not None or None in (x1, y1, x2, y2):
+            return _crop_region(full if full is not None else self.gray if grayscale else self.image, x1, y1, x2, y2)
         
-        # Capture the screen with the current resolution
-        screenshot = sct.grab(monitor)
-        img = np.array(screenshot)
+        key = ("region", grayscale, x1, y1, x2, y2)
+        cached = self.memo_get(key)
+        if cached is not None:
+            return cached
+        if bgra is not None:
+            crop, offset_x, offset_y = _crop_region(bgra, x1, y1, x2, y2)
+            region = cv2.cvtColor(crop, cv2.COLOR_BGRA2GRAY if grayscale else cv2.COLOR_BGRA2BGR)
+        else:
+            crop, offset_x, offset_y = _crop_region(image, x1, y1, x2, y2)
+            region = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        region.flags.writeable = False  # Shared between callers
+        self.memo_put(key, (region, offset_x, offset_y), region.nbytes)
+        return region, offset_x, offset_y
+
+    def pyramid(self, level, grayscale):
+        """Frame downscaled by 2**level, built once per frame and shared by all matches on it"""
+        key = (level, grayscale)
+        image = self._pyramid.get(key)
+        if image is None:
+            image = self.gray if grayscale else self.image
+            for _ in range(level):
+                image = cv2.pyrDown(image)
+            self._pyramid[key] = image
+        return image
+
+    @property
+    def thumbnail(self):
+        """Greyscale frame shrunk by CHANGE_THUMBNAIL_FACTOR, used to detect screen changes cheaply"""
+        if self._thumbnail is None:
+            height, width = self.shape
+            size = (max(1, width // CHANGE_THUMBNAIL_FACTOR), max(1, height // CHANGE_THUMBNAIL_FACTOR))
+            with self._convert_lock:
+                gray, bgra = self._gray, self._bgra
+            if gray is None and bgra is not None:
+                # Shrinking first spares converting the whole screen just for the thumbnail
+                self._thumbnail = cv2.cvtColor(cv2.resize(bgra, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGRA2GRAY)
+            else:
+                self._thumbnail = cv2.resize(self.gray, size, interpolation=cv2.INTER_AREA)
+        return self._thumbnail
+
+    def memo_get(self, key):
+        """Get a result memoised on this frame, None if it wasn't computed yet"""
+        with self._memo_lock:
+            entry = self._memo.get(key)
+            if entry is None:
+                return None
+            self._memo.move_to_end(key)
+            return entry[0]
+
+    def memo_put(self, key, value, nbytes):
+        """Memoise a result on this frame, evicting the least recently used ones above FRAME_MEMO_MAX_BYTES"""
+        with self._memo_lock:
+            if key in self._memo:
+                return
+            self._memo[key] = (value, nbytes)
+            self._memo_bytes += nbytes
+            while self._memo_bytes > FRAME_MEMO_MAX_BYTES and len(self._memo) > 1:
+                _, (_, evicted_bytes) = self._memo.popitem(last=False)
+                self._memo_bytes -= evicted_bytes
+
+    def touch(self):
+        """Mark the frame as just used by a match"""
+        self.last_used = time.monotonic()
+
+    def age(self):
+        """Seconds since the frame was captured"""
+        return time.monotonic() - self.timestamp
+
+    def idle(self):
+        """Seconds since the frame was last used"""
+        return time.monotonic() - self.last_used
+
+_frame_lock = threading.Lock()
+_frame_generation = 0
+_frame_generation_lock = threading.Lock()
+_current_frame: Frame | None = None
+_last_input_time = 0.0  # time.monotonic() of the latest input action, frames grabbed before it are outdated
+
+def _capture_frame(mon_idx):
+    """Grab a new pooled Frame of a monitor"""
+    global _frame_generation
+    with _frame_generation_lock:
+        _frame_generation += 1
+        generation = _frame_generation
+    timestamp = time.monotonic()
+    bgra = _grab_bgra(_validate_monitor_index(mon_idx))
+    # Colours are converted by the matches, only as far as their regions need
+    return Frame(None, generation, mon_idx, pooled=True, timestamp=timestamp, bgra=bgra)
+
+def get_frame(monitor_index=None, max_age=None, newer_than=None):
+    """Get the cached frame of the game monitor, capturing a new one when it is stale.
+
+    With a vision worker running its frames are read from shared memory, and with
+    background capture running the newest frame of the capture thread is taken,
+    instead of grabbing the screen here.
+
+    Args:
+        monitor_index: Monitor to capture, defaults to the game monitor
+        max_age: Longest acceptable time since the frame was last used, defaults to FRAME_CACHE_MAX_AGE.
+                 Frames older than FRAME_CACHE_MAX_LIFETIME are never reused. Use 0 to force a capture.
+        newer_than: Only accept a frame grabbed after this time.monotonic() timestamp,
+                    frames grabbed before the latest input action are never accepted
+    """
+    global _current_frame
+    mon_idx = monitor_index if monitor_index is not None else shared_vars.game_monitor
+    if max_age is None:
+        max_age = FRAME_CACHE_MAX_AGE
+    newer_than = max(newer_than or 0.0, _last_input_time)
+    
+    with _frame_lock:
+        frame = _current_frame
+        # Back to back matches keep sharing a frame, so a check and the click after it see the same screen
+        if (frame is not None and frame.monitor_index == mon_idx and max_age > 0 and frame.timestamp > newer_than
+                and frame.idle() <= max_age and frame.age() <= FRAME_CACHE_MAX_LIFETIME):
+            frame.touch()
+            return frame
         
-        # Convert the color from BGRA to BGR for OpenCV compatibility
-        img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+        # A forced capture still needs a frame grabbed from now on
+        since = newer_than if max_age > 0 else max(newer_than, time.monotonic())
+        frame = _vision_worker_frame(mon_idx, since)
+        if frame is None and BACKGROUND_CAPTURE_ENABLED:
+            start_background_capture()
+        producer = _frame_producer
+        if frame is None and producer is not None and producer.running():
+            frame = producer.latest(mon_idx, newer_than=since, timeout=BACKGROUND_CAPTURE_WAIT)
+        if frame is None:
+            frame = _capture_frame(mon_idx)
+        frame.touch()
+        _current_frame = frame
+        return frame
+
+def invalidate_frame_cache():
+    """Drop the cached frame so the next match sees the outcome of an input action"""
+    global _current_frame, _last_input_time
+    with _frame_lock:
+        _current_frame = None
+        _last_input_time = time.monotonic()
+
+def get_frame_generation():
+    """Generation number of the latest captured frame, increases on every new capture"""
+    return _frame_generation
+
+# ==================== BACKGROUND CAPTURE ====================
+
+BACKGROUND_CAPTURE_ENABLED = False  # Grab the game monitor continuously from a thread instead of on demand
+BACKGROUND_CAPTURE_FPS = 20  # Grabs per second of the capture thread
+BACKGROUND_CAPTURE_RING_SIZE = 3  # Newest frames kept by the capture thread
+BACKGROUND_CAPTURE_WAIT = 0.5  # Seconds to wait for a new enough frame before grabbing one directly
+
+class FrameProducer:
+    """Grabs the game monitor at a fixed rate into a ring of the newest frames.
+    
+    Consumers take the newest frame instead of grabbing the screen themselves, so
+    capture overlaps with matching and concurrent threads share the same grabs.
+    """
+
+    def __init__(self, fps=BACKGROUND_CAPTURE_FPS, ring_size=BACKGROUND_CAPTURE_RING_SIZE):
+        self.fps = fps
+        self.frames = deque(maxlen=ring_size)
+        self.grabs = 0
+        self._new_frame = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def running(self):
+        """Check if the capture thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the capture thread, does nothing if it's already running"""
+        if self.running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="frame_producer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the capture thread and drop the buffered frames"""
+        self._stop.set()
+        with self._new_frame:
+            self.frames.clear()
+            self._new_frame.notify_all()
+
+    def latest(self, monitor_index, newer_than=0.0, timeout=None):
+        """Get the newest frame of a monitor grabbed after newer_than.
         
-        return img
+        Returns:
+            The frame, or None if no such frame arrived within timeout seconds
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._new_frame:
+            while True:
+                if self.frames:
+                    frame = self.frames[-1]
+                    if frame.monitor_index == monitor_index and frame.timestamp > newer_than:
+                        return frame
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if self._stop.is_set() or (remaining is not None and remaining <= 0):
+                    return None
+                self._new_frame.wait(remaining)
+
+    def _run(self):
+        """Grab frames at fps until stopped"""
+        interval = 1.0 / self.fps
+        while not self._stop.is_set():
+            start = time.monotonic()
+            try:
+                frame = _capture_frame(shared_vars.game_monitor)
+            except Exception as e:
+                logger.error(f"Background capture failed: {e}")
+                self._stop.wait(1.0)
+                continue
+            with self._new_frame:
+                self.frames.append(frame)
+                self.grabs += 1
+                self._new_frame.notify_all()
+            self._stop.wait(max(0.0, interval - (time.monotonic() - start)))
+
+_frame_producer: FrameProducer | None = None
+_frame_producer_lock = threading.Lock()
+
+def start_background_capture(fps=None):
+    """Start the shared capture thread, get_frame uses its frames from then on"""
+    global _frame_producer
+    with _frame_producer_lock:
+        if _frame_producer is None or not _frame_producer.running():
+            _frame_producer = FrameProducer(fps or BACKGROUND_CAPTURE_FPS)
+            _frame_producer.start()
+            logger.info(f"Background capture started at {_frame_producer.fps} fps")
+        return _frame_producer
+
+def stop_background_capture():
+    """Stop the shared capture thread, get_frame grabs on demand again"""
+    global _frame_producer
+    with _frame_producer_lock:
+        if _frame_producer is not None:
+            _frame_producer.stop()
+            _frame_producer = None
+
+# ==================== CHANGE DETECTION ====================
+
+CHANGE_THUMBNAIL_FACTOR = 16  # Downscale factor of the thumbnails compared between frames
+CHANGE_THRESHOLD = 6  # Largest grey level difference of any thumbnail block below which a region counts as unchanged
+STATIC_REUSE_CACHE_SIZE = 64  # Max number of remembered results for static_reuse checks
+
+_static_results = OrderedDict()  # (template, threshold, colour mode, region) -> (thumbnail region, found)
+_static_results_lock = threading.Lock()
+_change_stats = {"skipped": 0, "evaluated": 0}
+
+def _thumbnail_region(frame, x1=None, y1=None, x2=None, y2=None):
+    """Part of the frame thumbnail covering a screen region, the whole thumbnail without a region"""
+    thumbnail = frame.thumbnail
+    if None in (x1, y1, x2, y2):
+        return thumbnail
+    factor = CHANGE_THUMBNAIL_FACTOR
+    # Round outwards so a change on the region border is never missed
+    region, _, _ = _crop_region(thumbnail, x1 // factor, y1 // factor, -(-x2 // factor), -(-y2 // factor))
+    return region
+
+def region_changed(previous, current):
+    """Check if two thumbnail regions differ by more than CHANGE_THRESHOLD"""
+    if previous.shape != current.shape or current.size == 0:
+        return True
+    # Max rather than mean so a small element appearing on a large region still counts
+    return cv2.norm(previous, current, cv2.NORM_INF) > CHANGE_THRESHOLD
+
+def get_change_detection_stats():
+    """Get counters of checks skipped because the screen didn't change and checks evaluated"""
+    return dict(_change_stats)
+
+def reset_change_detection():
+    """Forget remembered results and reset the counters"""
+    with _static_results_lock:
+        _static_results.clear()
+        _change_stats["skipped"] = 0
+        _change_stats["evaluated"] = 0
 
 def save_match_screenshot(screenshot, top_left, bottom_right, template_path, match_index):
     """Saves a screenshot of the matched region, preserving directory structure in 'higher_res'."""
@@ -309,6 +829,11 @@ def get_template_reference_resolution(template_path):
         # For non-1080p templates, use the 1440p template dimensions
         return REFERENCE_WIDTH_1440P, REFERENCE_HEIGHT_1440P
 
+def get_template_scale_factor(template_path, screen_width, screen_height):
+    """Uniform factor a template is resized by to match a screen of the given size"""
+    base_width, base_height = get_template_reference_resolution(template_path)
+    return min(screen_width / base_width, screen_height / base_height)
+
 def _extract_coordinates(filtered_boxes, area="center", crop_offset_x=0, crop_offset_y=0):
     """Extract coordinates from filtered boxes based on area preference"""
     found_elements = []
@@ -373,165 +898,715 @@ def _get_caller_info():
         pass
     return "unknown"
 
-def _base_match_template(template_path, threshold=0.8, grayscale=False,no_grayscale=False, debug=False, area="center", quiet_failure=False, x1=None, y1=None, x2=None, y2=None):
-    """Internal function that handles all template matching logic"""
+def _crop_region(image, x1=None, y1=None, x2=None, y2=None):
+    """Crop image to the region clamped to its bounds. Returns (region, offset_x, offset_y)"""
+    if x1 is None or y1 is None or x2 is None or y2 is None:
+        return image, 0, 0
+    height, width = image.shape[:2]
+    # Ensure coordinates are within bounds
+    x1 = max(0, min(x1, width))
+    y1 = max(0, min(y1, height))
+    x2 = max(x1, min(x2, width))
+    y2 = max(y1, min(y2, height))
+    return image[y1:y2, x1:x2], x1, y1
+
+# ==================== PYRAMID MATCHING ====================
+
+PYRAMID_MATCHING_ENABLED = False  # Find candidates on a downscaled frame and verify them at full resolution
+PYRAMID_LEVEL = 1  # Downscale factor is 2**level, so 1 matches at half and 2 at quarter resolution
+PYRAMID_COARSE_MARGIN = 0.15  # Coarse scores run lower than full resolution ones, accept candidates this far below threshold
+PYRAMID_MAX_CANDIDATES = 100  # Coarse peaks re-verified at full resolution, with more of them the region is matched at full resolution
+PYRAMID_MIN_TEMPLATE_SIZE = 12  # Templates whose downscaled side gets smaller than this are matched at full resolution
+PYRAMID_MIN_DETAIL = 0.75  # Templates keeping less of their detail when downscaled are matched at full resolution
+
+# Tiny icons lose too much detail when downscaled
+PYRAMID_EXCLUDED_TEMPLATES = {
+    "pictures/mirror/packs/status/owned.png",
+    "pictures/mirror/rewards/owned.png",
+}
+PYRAMID_EXCLUDED_FOLDERS = {
+    "pictures/mirror/restshop/enhance",
+}
+
+def _coarse_border(level):
+    """Width of the template edge whose downscaled pixels also depend on the screen around the template"""
+    return 2 * ((1 << level) - 1)
+
+def _use_pyramid(template_path, template, level):
+    """Check if a template can be matched coarse-to-fine at the given pyramid level"""
+    if template_path in PYRAMID_EXCLUDED_TEMPLATES or os.path.dirname(template_path) in PYRAMID_EXCLUDED_FOLDERS:
+        return False
+    return (min(template.shape[:2]) - 2 * _coarse_border(level)) >> level >= PYRAMID_MIN_TEMPLATE_SIZE
+
+def _get_coarse_templates(template_path, use_grayscale, scale_factor, level):
+    """Downscaled templates for every phase of the pyramid grid, built once per template.
     
-    full_template_path = resource_path(template_path)
-        
-    screenshot = capture_screen()
-    original_screenshot_height, original_screenshot_width = screenshot.shape[:2]
-    
-    # Handle region cropping
-    crop_offset_x = 0
-    crop_offset_y = 0
-    if x1 is not None and y1 is not None and x2 is not None and y2 is not None:
-        # Ensure coordinates are within bounds
-        x1 = max(0, min(x1, original_screenshot_width))
-        y1 = max(0, min(y1, original_screenshot_height))
-        x2 = max(x1, min(x2, original_screenshot_width))
-        y2 = max(y1, min(y2, original_screenshot_height))
+    pyrDown keeps one pixel out of 2**level on each axis, so the coarse image of a match
+    depends on where it sits relative to that grid, and its edge on the screen around it.
+    A single downscaled template can then score far below the full resolution match. Each
+    phase gets its own coarse template cut from the template interior so it lines up with
+    the grid the way the frame does.
+    
+    Returns:
+        (phases, detail) where phases are (crop_x, crop_y, coarse_template) and detail is the
+        correlation of the template with its downscaled and upscaled again copy
+    """
+    key = (template_path, ("coarse", use_grayscale), scale_factor, level)
+    entry = _template_cache_get(key)
+    if entry is None:
+        template, _ = get_template(template_path, use_grayscale, scale_factor)
+        factor = 1 << level
+        border = _coarse_border(level)
+        height, width = template.shape[:2]
+        phases = []
+        for phase_y in range(factor):
+            for phase_x in range(factor):
+                # Cropped so the coarse template starts on the grid for a match at this phase
+                crop_x = border + (-(phase_x + border)) % factor
+                crop_y = border + (-(phase_y + border)) % factor
+                coarse_template = np.ascontiguousarray(template[crop_y:height - border, crop_x:width - border])
+                for _ in range(level):
+                    coarse_template = cv2.pyrDown(coarse_template)
+                coarse_template.flags.writeable = False  # Shared between callers
+                phases.append((crop_x, crop_y, coarse_template))
         
-        # Crop screenshot to specified region
-        screenshot = screenshot[y1:y2, x1:x2]
-        crop_offset_x = x1
-        crop_offset_y = y1
+        interior = np.ascontiguousarray(template[border:height - border, border:width - border])
+        restored = interior
+        for _ in range(level):
+            restored = cv2.pyrDown(restored)
+        for _ in range(level):
+            restored = cv2.pyrUp(restored)
+        restored = restored[:interior.shape[0], :interior.shape[1]]
+        detail = float(cv2.matchTemplate(interior.astype(np.float32), restored.astype(np.float32), cv2.TM_CCOEFF_NORMED)[0, 0])
+        entry = (phases, detail if np.isfinite(detail) else 0.0)
+        _template_cache_put(key, entry)
+    return entry
+
+def _pyramid_match(frame, template_path, use_grayscale, scale_factor, screenshot, template,
+                   crop_offset_x, crop_offset_y, threshold, level):
+    """Coarse-to-fine matching, returns a score map shaped like a full resolution matchTemplate result.
     
-    # Use original dimensions for scale factor calculation, not cropped dimensions
-    screenshot_height, screenshot_width = original_screenshot_height, original_screenshot_width
+    Only windows around the coarse candidates are scored at full resolution, every
+    other position is left at -1 so it can never pass the threshold. Templates that
+    lose too much detail when downscaled, regions too small for the coarse templates
+    and regions with too many candidates are matched at full resolution instead.
+    """
+    phases, detail = _get_coarse_templates(template_path, use_grayscale, scale_factor, level)
+    if detail < PYRAMID_MIN_DETAIL:
+        return cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+    factor = 1 << level
+    template_height, template_width = template.shape[:2]
+    region_height, region_width = screenshot.shape[:2]
     
-    # no_grayscale=True should completely prevent grayscale conversion
-    if not no_grayscale and (grayscale or shared_vars.convert_images_to_grayscale):
-        screenshot = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
+    # Coarse pass on the shared frame pyramid, once per grid phase
+    coarse_frame = frame.pyramid(level, use_grayscale)
+    coarse_x1, coarse_y1 = crop_offset_x // factor, crop_offset_y // factor
+    coarse_screenshot = coarse_frame[coarse_y1:coarse_y1 + region_height // factor,
+                                     coarse_x1:coarse_x1 + region_width // factor]
+    candidates = []
+    candidate_count = 0
+    for crop_x, crop_y, coarse_template in phases:
+        if (coarse_screenshot.shape[0] < coarse_template.shape[0]
+                or coarse_screenshot.shape[1] < coarse_template.shape[1]):
+            return cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+        coarse_result = cv2.matchTemplate(coarse_screenshot, coarse_template, cv2.TM_CCOEFF_NORMED)
+        coarse_xs, coarse_ys, _ = vision_utils.find_peaks(coarse_result, threshold - PYRAMID_COARSE_MARGIN)
+        candidate_count += len(coarse_xs)
+        if candidate_count > PYRAMID_MAX_CANDIDATES:
+            # Keeping only the best coarse peaks could drop the true match
+            return cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+        # Region positions of the full template whose cropped interior starts at these coarse pixels
+        candidates.append(((coarse_x1 + coarse_xs) * factor - crop_x - crop_offset_x,
+                           (coarse_y1 + coarse_ys) * factor - crop_y - crop_offset_y))
     
-    base_width, base_height = get_template_reference_resolution(full_template_path)
+    # Fine pass in a small window around each candidate
+    result = np.full((region_height - template_height + 1, region_width - template_width + 1), -1.0, dtype=np.float32)
+    margin = factor
+    for candidate_xs, candidate_ys in candidates:
+        for x, y in zip(candidate_xs, candidate_ys):
+            x_start, y_start = max(0, x - margin), max(0, y - margin)
+            x_end = min(result.shape[1], x + margin + 1)
+            y_end = min(result.shape[0], y + margin + 1)
+            if x_start >= x_end or y_start >= y_end:
+                continue
+            window = screenshot[y_start:y_end + template_height - 1, x_start:x_end + template_width - 1]
+            window_result = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+            np.maximum(result[y_start:y_end, x_start:x_end], window_result, out=result[y_start:y_end, x_start:x_end])
+    return result
+
+# ==================== HYBRID COLOUR MATCHING ====================
+
+HYBRID_COLOUR_MATCHING_ENABLED = True  # Locate colour templates in grey and score only the candidates in colour
+HYBRID_GREY_MARGIN = 0.15  # Grey scores of a colour match can run lower, accept candidates this far below threshold
+HYBRID_MAX_CANDIDATES = 500  # Grey peaks verified in colour one by one, with more of them matching the whole region in colour is cheaper
+HYBRID_VERIFY_RADIUS = 2  # Pixels around a grey peak scored in colour, grey and colour peaks can be a pixel apart
+
+def _get_hybrid_gray_template(template_path, scale_factor):
+    """Grey version of a colour template converted from it, so it scores against the grey frame like the colour one does.
     
-    scale_factor_x = screenshot_width / base_width
-    scale_factor_y = screenshot_height / base_height
-    scale_factor = min(scale_factor_x, scale_factor_y)
+    Decoding with IMREAD_GRAYSCALE differs for templates with an alpha channel.
+    """
+    key = (template_path, "hybrid", scale_factor)
+    entry = _template_cache_get(key)
+    if entry is None:
+        template, adjustment = get_template(template_path, False, scale_factor)
+        gray_template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        gray_template.flags.writeable = False  # Shared between callers
+        entry = (gray_template, adjustment)
+        _template_cache_put(key, entry)
+    return entry[0]
+
+def _hybrid_colour_match(frame, template_path, scale_factor, template, gray_screenshot,
+                         crop_offset_x, crop_offset_y, threshold):
+    """Grey locate then colour verify, returns a score map shaped like a full colour matchTemplate result.
     
-    # no_grayscale=True should completely prevent grayscale conversion
-    if no_grayscale:
-        color_flag = cv2.IMREAD_COLOR
-    else:
-        color_flag = cv2.IMREAD_GRAYSCALE if (grayscale or shared_vars.convert_images_to_grayscale) else cv2.IMREAD_COLOR
-    template = cv2.imread(full_template_path, color_flag)
-    if template is None:
-        raise FileNotFoundError(f"Template image '{full_template_path}' not found.")
+    Colour scores are computed with the same TM_CCOEFF_NORMED as a full colour match but only in
+    small windows around the grey candidates, every other position is left at -1 so it can never
+    pass the threshold.
+    """
+    template_height, template_width = template.shape[:2]
+    gray_template = _get_hybrid_gray_template(template_path, scale_factor)
+    gray_result = cv2.matchTemplate(gray_screenshot, gray_template, cv2.TM_CCOEFF_NORMED)
+    candidate_xs, candidate_ys, _ = vision_utils.find_peaks(gray_result, threshold - HYBRID_GREY_MARGIN)
+    if len(candidate_xs) > HYBRID_MAX_CANDIDATES:
+        # Keeping only the best grey peaks could drop a true colour match, score every position instead
+        height, width = gray_screenshot.shape[:2]
+        screenshot, _, _ = frame.region(False, crop_offset_x, crop_offset_y, crop_offset_x + width, crop_offset_y + height)
+        return cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
     
-    # Skip scaling for CustomFuse images - use them at their original resolution
-    if is_custom_fuse_image(full_template_path):
-        pass
-    else:
-        template = cv2.resize(template, None, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_LINEAR)
+    result = np.full(gray_result.shape, -1.0, dtype=np.float32)
+    pixels = frame.pixels
+    radius = HYBRID_VERIFY_RADIUS
+    for x, y in zip(candidate_xs, candidate_ys):
+        x_start, y_start = max(0, x - radius), max(0, y - radius)
+        x_end, y_end = min(result.shape[1], x + radius + 1), min(result.shape[0], y + radius + 1)
+        window = pixels[crop_offset_y + y_start:crop_offset_y + y_end + template_height - 1,
+                        crop_offset_x + x_start:crop_offset_x + x_end + template_width - 1]
+        # Only the window is converted when the frame still holds the raw grab
+        window = cv2.cvtColor(window, cv2.COLOR_BGRA2BGR) if window.shape[2] == 4 else window
+        window_result = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+        np.maximum(result[y_start:y_end, x_start:x_end], window_result, out=result[y_start:y_end, x_start:x_end])
+    return result
+
+def _score_on_frame(frame, template_path, threshold, use_grayscale, x1=None, y1=None, x2=None, y2=None, pyramid=None):
+    """Compute the match score map of one template against a captured frame.
     
-    template_height, template_width = template.shape[:2]
+    Returns:
+        (result, threshold, template_size, crop_offset_x, crop_offset_y) where threshold has the
+        scale and user adjustments applied and template_size is (width, height)
+    """
+    # Use full frame dimensions for scale factor calculation, not cropped dimensions
+    screenshot_height, screenshot_width = frame.shape
+    # Colour matches search the grey frame for candidates first, the colour region is never needed as a whole
+    use_hybrid = not use_grayscale and HYBRID_COLOUR_MATCHING_ENABLED
+    # Only the searched region gets colour converted unless another match already converted the whole screen
+    screenshot, crop_offset_x, crop_offset_y = frame.region(use_grayscale or use_hybrid, x1, y1, x2, y2)
     
-    # Ensure both screenshot and template have matching color formats
-    if no_grayscale:
-        # Force color mode - ensure both are BGR
-        if len(screenshot.shape) == 2:
-            screenshot = cv2.cvtColor(screenshot, cv2.COLOR_GRAY2BGR)
-        if len(template.shape) == 2:
-            template = cv2.cvtColor(template, cv2.COLOR_GRAY2BGR)
-    else:
-        # Allow grayscale mode - ensure both are grayscale if conversion is enabled
-        if (grayscale or shared_vars.convert_images_to_grayscale):
-            if len(screenshot.shape) == 3:
-                screenshot = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-            if len(template.shape) == 3:
-                template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+    scale_factor = get_template_scale_factor(resource_path(template_path), screenshot_width, screenshot_height)
     
-    result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+    # Decoded, resized template and its threshold adjustment come from the template cache
+    template, total_adjustment = get_template(template_path, use_grayscale, scale_factor)
+    template_height, template_width = template.shape[:2]
     
     if scale_factor < 0.75:
         threshold = threshold - 0.05
     
     # Apply threshold adjustment from user configuration
-    total_adjustment = get_total_threshold_adjustment(template_path)
     threshold = threshold + total_adjustment
     
-    locations = np.where(result >= threshold)
-    boxes = []
-    match_scores = []
+    if screenshot.shape[0] < template_height or screenshot.shape[1] < template_width:
+        # Region can't contain the template, nothing to find
+        return np.empty((0, 0), dtype=np.float32), threshold, (template_width, template_height), crop_offset_x, crop_offset_y
     
-    for pt in zip(*locations[::-1]):
-        top_left = pt
-        bottom_right = (top_left[0] + template_width, top_left[1] + template_height)
-        boxes.append([top_left[0], top_left[1], bottom_right[0], bottom_right[1]])
-        match_scores.append(result[top_left[1], top_left[0]])
+    if pyramid is None:
+        pyramid = PYRAMID_MATCHING_ENABLED
+    use_pyramid = pyramid and not use_hybrid and _use_pyramid(template_path, template, PYRAMID_LEVEL)
     
-    boxes = np.array(boxes)
-    filtered_boxes = non_max_suppression_fast(boxes)
+    # A check followed by a click, another area or another threshold on the same frame reuse the score map.
+    # Pyramid and hybrid maps only hold candidates above the threshold, so theirs is part of the key.
+    memo_key = ("scores", template_path, use_grayscale, crop_offset_x, crop_offset_y, screenshot.shape[:2],
+                threshold if use_pyramid or use_hybrid else None)
+    result = frame.memo_get(memo_key)
+    if result is None:
+        if use_hybrid:
+            result = _hybrid_colour_match(frame, template_path, scale_factor, template, screenshot,
+                                          crop_offset_x, crop_offset_y, threshold)
+        elif use_pyramid:
+            result = _pyramid_match(frame, template_path, use_grayscale, scale_factor, screenshot, template,
+                                    crop_offset_x, crop_offset_y, threshold, PYRAMID_LEVEL)
+        else:
+            result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+        result.flags.writeable = False  # Shared between callers
+        frame.memo_put(memo_key, result, result.nbytes)
+    frame.touch()
+    return result, threshold, (template_width, template_height), crop_offset_x, crop_offset_y
+
+def _match_on_frame(frame, template_path, threshold, use_grayscale, x1=None, y1=None, x2=None, y2=None, pyramid=None):
+    """Match one template against a captured frame.
     
-    if not quiet_failure:
-        caller_info = _get_caller_info()
+    Args:
+        pyramid: Use coarse-to-fine matching, defaults to PYRAMID_MATCHING_ENABLED
+    
+    Returns:
+        (filtered_boxes, crop_offset_x, crop_offset_y, highest_match_rate), boxes are relative to the searched region
+    """
+    result, threshold, (template_width, template_height), crop_offset_x, crop_offset_y = _score_on_frame(
+        frame, template_path, threshold, use_grayscale, x1, y1, x2, y2, pyramid)
+    
+    memo_key = ("boxes", template_path, use_grayscale, crop_offset_x, crop_offset_y, result.shape, threshold, pyramid)
+    detections = frame.memo_get(memo_key)
+    if detections is None:
+        # Peaks, boxes and suppression are computed on whole arrays instead of per pixel
+        filtered_boxes, _ = vision_utils.extract_boxes(result, threshold, template_width, template_height)
+        filtered_boxes.flags.writeable = False  # Shared between callers
         highest_match_rate = result.max() if result.size > 0 else 0.0
-        if len(filtered_boxes) > 0:
-            # Get center coordinates of matches for logging (adjusted for crop offset)
-            locations = []
-            for box in filtered_boxes:
-                center_x = int((box[0] + box[2]) / 2) + crop_offset_x
-                center_y = int((box[1] + box[3]) / 2) + crop_offset_y
-                locations.append(f"({center_x},{center_y})")
-            locations_str = ", ".join(locations)
-            logger.debug(f"Match found: {template_path} at {locations_str} - found {len(filtered_boxes)} matches - {caller_info}. Highest match rate: {highest_match_rate}", dirty=True)
-        else:
-            logger.debug(f"Match not found: {template_path} - {caller_info}. Highest match rate: {highest_match_rate}", dirty=True)
+        detections = (filtered_boxes, highest_match_rate)
+        frame.memo_put(memo_key, detections, filtered_boxes.nbytes)
+    filtered_boxes, highest_match_rate = detections
+    return filtered_boxes, crop_offset_x, crop_offset_y, highest_match_rate
+
+def _log_match_result(template_path, filtered_boxes, crop_offset_x, crop_offset_y, highest_match_rate):
+    """Log match outcome together with the calling site"""
+    caller_info = _get_caller_info()
+    if len(filtered_boxes) > 0:
+        # Get center coordinates of matches for logging (adjusted for crop offset)
+        locations = []
+        for box in filtered_boxes:
+            center_x = int((box[0] + box[2]) / 2) + crop_offset_x
+            center_y = int((box[1] + box[3]) / 2) + crop_offset_y
+            locations.append(f"({center_x},{center_y})")
+        locations_str = ", ".join(locations)
+        logger.debug(f"Match found: {template_path} at {locations_str} - found {len(filtered_boxes)} matches - {caller_info}. Highest match rate: {highest_match_rate}", dirty=True)
+    else:
+        logger.debug(f"Match not found: {template_path} - {caller_info}. Highest match rate: {highest_match_rate}", dirty=True)
+
+def _draw_debug_matches(filtered_boxes):
+    """Outline matched boxes on the desktop for visual debugging"""
     
-    if (debug or shared_vars.debug_image_matches) and len(filtered_boxes) > 0:
+    def draw_debug_rectangle(x, y, width, height, duration=1.0):
+        """Draw rectangle directly on desktop using orange color rgb(254, 176, 5)"""
         
-        def draw_debug_rectangle(x, y, width, height, duration=1.0):
-            """Draw rectangle directly on desktop using orange color rgb(254, 176, 5)"""
+        if platform.system() != 'Windows':
+            return
             
-            if platform.system() != 'Windows':
-                return
+        def draw_and_erase():
+            try:
+                user32 = ctypes.windll.user32
+                gdi32 = ctypes.windll.gdi32
                 
-            def draw_and_erase():
-                try:
-                    user32 = ctypes.windll.user32
-                    gdi32 = ctypes.windll.gdi32
-                    
-                    mon = get_monitor_info()
-                    x_int = int(mon['left'] + x)
-                    y_int = int(mon['top'] + y)
-                    w_int = int(width)
-                    h_int = int(height)
-                    
-                    desktop_dc = user32.GetDC(0)
-                    
-                    pen = gdi32.CreatePen(0, 4, 0x05B0FE)
-                    old_pen = gdi32.SelectObject(desktop_dc, pen)
-                    old_brush = gdi32.SelectObject(desktop_dc, gdi32.GetStockObject(5))
-                    
-                    gdi32.Rectangle(desktop_dc, x_int, y_int, x_int + w_int, y_int + h_int)
-                    
-                    time.sleep(duration)
-                    
-                    rect = wintypes.RECT(x_int - 5, y_int - 5, x_int + w_int + 5, y_int + h_int + 5)
-                    user32.InvalidateRect(0, ctypes.byref(rect), 1)
-                    
-                    gdi32.SelectObject(desktop_dc, old_pen)
-                    gdi32.SelectObject(desktop_dc, old_brush)
-                    gdi32.DeleteObject(pen)
-                    user32.ReleaseDC(0, desktop_dc)
-                    
-                except Exception as e:
-                    print(f"Debug rectangle error: {e}")
-            
-            threading.Thread(target=draw_and_erase, daemon=True).start()
+                mon = get_monitor_info()
+                x_int = int(mon['left'] + x)
+                y_int = int(mon['top'] + y)
+                w_int = int(width)
+                h_int = int(height)
+                
+                desktop_dc = user32.GetDC(0)
+                
+                pen = gdi32.CreatePen(0, 4, 0x05B0FE)
+                old_pen = gdi32.SelectObject(desktop_dc, pen)
+                old_brush = gdi32.SelectObject(desktop_dc, gdi32.GetStockObject(5))
+                
+                gdi32.Rectangle(desktop_dc, x_int, y_int, x_int + w_int, y_int + h_int)
+                
+                time.sleep(duration)
+                
+                rect = wintypes.RECT(x_int - 5, y_int - 5, x_int + w_int + 5, y_int + h_int + 5)
+                user32.InvalidateRect(0, ctypes.byref(rect), 1)
+                
+                gdi32.SelectObject(desktop_dc, old_pen)
+                gdi32.SelectObject(desktop_dc, old_brush)
+                gdi32.DeleteObject(pen)
+                user32.ReleaseDC(0, desktop_dc)
+                
+            except Exception as e:
+                print(f"Debug rectangle error: {e}")
         
-        for (x1, y1, x2, y2) in filtered_boxes:
-            padding = 8
-            draw_debug_rectangle(
-                x1 - padding, 
-                y1 - padding, 
-                (x2 - x1) + (padding * 2), 
-                (y2 - y1) + (padding * 2), 
-                2.0
-            )
+        threading.Thread(target=draw_and_erase, daemon=True).start()
+    
+    for (x1, y1, x2, y2) in filtered_boxes:
+        padding = 8
+        draw_debug_rectangle(
+            x1 - padding, 
+            y1 - padding, 
+            (x2 - x1) + (padding * 2), 
+            (y2 - y1) + (padding * 2), 
+            2.0
+        )
+
+# ==================== LEARNED REGIONS ====================
+
+LEARNED_REGIONS_ENABLED = True  # Single match lookups search where a template was seen before first, the full frame only on a miss
+LEARNED_REGION_MIN_SAMPLES = 3  # Matches observed before the learned region is trusted
+LEARNED_REGION_MARGIN = 0.03  # Padding around the learned region as a share of the frame size
+LEARNED_REGION_MAX_AREA = 0.5  # Regions covering more of the frame than this aren't worth a separate search
+LEARNED_REGIONS_SAVE_INTERVAL = 60  # Min seconds between writes of the learned statistics
+LEARNED_REGIONS_PATH = os.path.join(BASE_PATH, "template_cache", "learned_regions.json")
+
+_learned_regions = None  # Template path -> statistics, loaded on first use
+_learned_regions_lock = threading.Lock()
+_learned_regions_dirty = False
+_learned_regions_saved_at = 0.0
+
+def _load_learned_regions():
+    """Load learned region statistics from disk, must hold _learned_regions_lock"""
+    global _learned_regions
+    if _learned_regions is None:
+        try:
+            with open(LEARNED_REGIONS_PATH, "r") as f:
+                _learned_regions = json.load(f)
+        except (OSError, ValueError):
+            _learned_regions = {}
+    return _learned_regions
+
+def save_learned_regions(force=False):
+    """Write learned region statistics to disk if they changed and the save interval passed"""
+    global _learned_regions_dirty, _learned_regions_saved_at
+    with _learned_regions_lock:
+        if not _learned_regions_dirty:
+            return
+        if not force and time.monotonic() - _learned_regions_saved_at < LEARNED_REGIONS_SAVE_INTERVAL:
+            return
+        data = json.dumps(_learned_regions)
+        _learned_regions_dirty = False
+        _learned_regions_saved_at = time.monotonic()
+    try:
+        os.makedirs(os.path.dirname(LEARNED_REGIONS_PATH), exist_ok=True)
+        tmp_path = f"{LEARNED_REGIONS_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, LEARNED_REGIONS_PATH)
+    except OSError as e:
+        logger.debug(f"Could not save learned regions: {e}")
+
+def get_learned_region_stats(template_path=None):
+    """Get learned region statistics of one template, or of all templates when no path is given"""
+    with _learned_regions_lock:
+        regions = _load_learned_regions()
+        if template_path is None:
+            return {path: dict(stats) for path, stats in regions.items()}
+        stats = regions.get(template_path)
+        return dict(stats) if stats else None
+
+def _get_learned_region(template_path, frame_width, frame_height):
+    """Get the padded learned region of a template in pixels, None when there is no usable one"""
+    with _learned_regions_lock:
+        stats = _load_learned_regions().get(template_path)
+        if not stats or stats["samples"] < LEARNED_REGION_MIN_SAMPLES:
+            return None
+        x1, y1, x2, y2 = stats["region"]
+    if (x2 - x1) * (y2 - y1) > LEARNED_REGION_MAX_AREA:
+        return None
+    return (int(max(0.0, x1 - LEARNED_REGION_MARGIN) * frame_width),
+            int(max(0.0, y1 - LEARNED_REGION_MARGIN) * frame_height),
+            int(min(1.0, x2 + LEARNED_REGION_MARGIN) * frame_width + 1),
+            int(min(1.0, y2 + LEARNED_REGION_MARGIN) * frame_height + 1))
+
+def _record_match_location(template_path, filtered_boxes, crop_offset_x, crop_offset_y, frame_width, frame_height, outcome=None):
+    """Grow the learned region of a template by its matched boxes and count the learned search outcome.
+    
+    Only a changed region, or one that just became trusted, marks the statistics for saving,
+    the counters are written along with the next such change.
+    
+    Args:
+        outcome: "hits" when found inside the learned region, "misses" when the full frame had to be searched
+    """
+    global _learned_regions_dirty
+    with _learned_regions_lock:
+        regions = _load_learned_regions()
+        stats = regions.get(template_path)
+        if stats is None:
+            if len(filtered_boxes) == 0:
+                return
+            stats = regions[template_path] = {"region": None, "samples": 0, "hits": 0, "misses": 0}
+        if outcome:
+            stats[outcome] += 1
+        changed = False
+        for box_x1, box_y1, box_x2, box_y2 in filtered_boxes:
+            box = [float(box_x1 + crop_offset_x) / frame_width, float(box_y1 + crop_offset_y) / frame_height,
+                   float(box_x2 + crop_offset_x) / frame_width, float(box_y2 + crop_offset_y) / frame_height]
+            region = stats["region"]
+            grown = box if region is None else [min(region[0], box[0]), min(region[1], box[1]),
+                                                max(region[2], box[2]), max(region[3], box[3])]
+            stats["samples"] += 1
+            if grown != region or stats["samples"] == LEARNED_REGION_MIN_SAMPLES:
+                stats["region"] = grown
+                changed = True
+        if not changed:
+            return
+        _learned_regions_dirty = True
+    save_learned_regions()
+
+def _match_with_learned_region(frame, template_path, threshold, use_grayscale, pyramid=None, single=False):
+    """Match on the full frame and learn where the template shows up.
+    
+    Args:
+        single: Only one detection is needed, so the learned region is searched first and the
+                full frame only if nothing was found there. Callers that need every instance
+                always search the full frame, which also lets the region grow to cover them.
+    
+    Returns:
+        Same as _match_on_frame
+    """
+    frame_height, frame_width = frame.shape
+    region = _get_learned_region(template_path, frame_width, frame_height) if single and LEARNED_REGIONS_ENABLED else None
+    outcome = None
+    if region is not None:
+        match = _match_on_frame(frame, template_path, threshold, use_grayscale, *region, pyramid)
+        if len(match[0]) > 0:
+            outcome = "hits"
+        else:
+            outcome = "misses"
+            match = _match_on_frame(frame, template_path, threshold, use_grayscale, pyramid=pyramid)
+    else:
+        match = _match_on_frame(frame, template_path, threshold, use_grayscale, pyramid=pyramid)
+    
+    filtered_boxes, crop_offset_x, crop_offset_y, _ = match
+    _record_match_location(template_path, filtered_boxes, crop_offset_x, crop_offset_y, frame_width, frame_height, outcome)
+    return match
+
+def _base_match_template(template_path, threshold=None, grayscale=False,no_grayscale=False, debug=False, area="center", quiet_failure=False, x1=None, y1=None, x2=None, y2=None, pyramid=None, single=False):
+    """Internal function that handles all template matching logic
+    
+    Args:
+        pyramid: Use coarse-to-fine matching, defaults to PYRAMID_MATCHING_ENABLED
+        single: Only the first detection is used, see _match_with_learned_region
+    """
+    # no_grayscale=True should completely prevent grayscale conversion
+    use_grayscale = not no_grayscale and (grayscale or shared_vars.convert_images_to_grayscale)
+    threshold, use_grayscale, x1, y1, x2, y2 = _apply_template_region(
+        template_path, threshold, use_grayscale, no_grayscale, x1, y1, x2, y2)
+    
+    # Matches within the same tick share one capture and its greyscale conversion
+    frame = get_frame()
+    if None in (x1, y1, x2, y2):
+        filtered_boxes, crop_offset_x, crop_offset_y, highest_match_rate = _match_with_learned_region(
+            frame, template_path, threshold, use_grayscale, pyramid, single)
+    else:
+        filtered_boxes, crop_offset_x, crop_offset_y, highest_match_rate = _match_on_frame(
+            frame, template_path, threshold, use_grayscale, x1, y1, x2, y2, pyramid)
+    
+    if not quiet_failure:
+        _log_match_result(template_path, filtered_boxes, crop_offset_x, crop_offset_y, highest_match_rate)
+    
+    if (debug or shared_vars.debug_image_matches) and len(filtered_boxes) > 0:
+        _draw_debug_matches(filtered_boxes)
     
     return _extract_coordinates(filtered_boxes, area, crop_offset_x, crop_offset_y)
 
+# ==================== PARALLEL MATCHING ====================
+
+# cv2.matchTemplate releases the GIL, so batched matches can run on several cores at once
+MATCH_WORKERS = max(1, min(4, (os.cpu_count() or 1) // 2))  # Threads used by match_many, 1 disables the pool
+
+_match_pool = None
+_match_pool_lock = threading.Lock()
+
+def _get_match_pool():
+    """Get the shared matching thread pool, None when parallel matching is disabled"""
+    global _match_pool
+    if MATCH_WORKERS <= 1:
+        return None
+    with _match_pool_lock:
+        if _match_pool is None:
+            _match_pool = ThreadPoolExecutor(max_workers=MATCH_WORKERS, thread_name_prefix="match_worker")
+            # Split OpenCV's own threads between the workers instead of letting each one use every core
+            cv2.setNumThreads(max(1, (os.cpu_count() or 1) // MATCH_WORKERS))
+            logger.debug(f"Started matching pool with {MATCH_WORKERS} workers")
+        return _match_pool
+
+def set_match_workers(workers):
+    """Resize the matching thread pool, 1 or less runs batched matches sequentially"""
+    global MATCH_WORKERS, _match_pool
+    with _match_pool_lock:
+        MATCH_WORKERS = max(1, int(workers))
+        if _match_pool is not None:
+            _match_pool.shutdown(wait=True)
+            _match_pool = None
+        if MATCH_WORKERS <= 1:
+            # Give OpenCV back its default thread count
+            cv2.setNumThreads(-1)
+
+def map_on_match_pool(function, items):
+    """Call function on each item using the matching pool, results keep the order of items"""
+    pool = _get_match_pool() if len(items) > 1 else None
+    if pool is None:
+        return [function(item) for item in items]
+    return list(pool.map(function, items))
+
+# ==================== VISION WORKER ====================
+
+_vision_worker = None  # vision_worker.VisionWorker matching and capture are handed to, None does both in process
+
+def set_vision_worker(worker):
+    """Route match_image, match_many, exists and get_frame through a vision worker process, None to work in process again"""
+    global _vision_worker
+    _vision_worker = worker
+
+def _on_vision_worker(operation, **kwargs):
+    """Run a match in the vision worker.
+    
+    Returns:
+        (True, result) when the worker answered, (False, None) when matching has to happen in process
+    """
+    worker = _vision_worker
+    # Debug outlines are drawn on this process's desktop
+    if worker is None or kwargs.get("debug") or shared_vars.debug_image_matches:
+        return False, None
+    try:
+        return True, worker.call(operation, **kwargs)
+    except Exception as e:
+        logger.warning(f"Vision worker {operation} failed, matching in process: {e}")
+        return False, None
+
+def _vision_worker_frame(monitor_index, newer_than):
+    """Get a game monitor frame grabbed by the vision worker, None when there is no worker or it failed"""
+    worker = _vision_worker
+    if worker is None or monitor_index != shared_vars.game_monitor:
+        return None
+    try:
+        return worker.frame(newer_than=newer_than)
+    except Exception as e:
+        logger.warning(f"Vision worker capture failed, capturing in process: {e}")
+        return None
+
+def match_many(template_paths, roi=None, thresholds=None, threshold=None, area="center", grayscale=False, no_grayscale=False, debug=False, quiet_failure=False):
+    """Match several templates against one captured frame in a single vision pass.
+    
+    Args:
+        template_paths: Templates to look for
+        roi: Optional (x1, y1, x2, y2) region in screen coordinates shared by all templates
+        thresholds: Optional per-template thresholds, either a dict keyed by path or a list aligned with template_paths
+        threshold: Threshold used for templates without an entry in thresholds, defaults to the
+                   manifest threshold of each template or DEFAULT_MATCH_THRESHOLD
+        
+    Returns:
+        Dict mapping each template path to its list of detections, same format as match_image
+    """
+    handled, results = _on_vision_worker("match_many", template_paths=list(template_paths), roi=roi, thresholds=thresholds,
+                                         threshold=threshold, area=area, grayscale=grayscale, no_grayscale=no_grayscale,
+                                         debug=debug, quiet_failure=quiet_failure)
+    if handled:
+        return results
+    
+    if isinstance(thresholds, dict):
+        template_thresholds = [thresholds.get(path, threshold) for path in template_paths]
+    elif thresholds is not None:
+        template_thresholds = list(thresholds)
+    else:
+        template_thresholds = [threshold] * len(template_paths)
+    x1, y1, x2, y2 = roi if roi is not None else (None, None, None, None)
+    
+    # no_grayscale=True should completely prevent grayscale conversion
+    use_grayscale = not no_grayscale and (grayscale or shared_vars.convert_images_to_grayscale)
+    
+    # Manifest defaults are resolved per template, the shared roi still wins
+    jobs = [(template_path, *_apply_template_region(template_path, template_threshold, use_grayscale, no_grayscale, x1, y1, x2, y2))
+            for template_path, template_threshold in zip(template_paths, template_thresholds)]
+    
+    # One capture and one colour conversion serve every template
+    frame = get_frame()
+    
+    matches = map_on_match_pool(lambda job: _match_on_frame(frame, *job), jobs)
+    
+    # Logging stays on the calling thread so the caller info points at the real call site
+    results = {}
+    for template_path, match in zip(template_paths, matches):
+        filtered_boxes, crop_offset_x, crop_offset_y, highest_match_rate = match
+        if not quiet_failure:
+            _log_match_result(template_path, filtered_boxes, crop_offset_x, crop_offset_y, highest_match_rate)
+        if (debug or shared_vars.debug_image_matches) and len(filtered_boxes) > 0:
+            _draw_debug_matches(filtered_boxes)
+        results[template_path] = _extract_coordinates(filtered_boxes, area, crop_offset_x, crop_offset_y)
+    return results
+
+# ==================== TEMPLATE CACHE ====================
+
+TEMPLATE_CACHE_SIZE = 256  # Max number of decoded templates kept in memory
+
+_template_cache = OrderedDict()
+_template_cache_lock = threading.Lock()
+_template_cache_threshold_config = None  # Threshold config the cached adjustments were computed from
+
+TEMPLATE_PACK_ENABLED = True  # Serve templates from the memory mapped pack built for the monitor resolution
+
+_template_pack = None
+_template_pack_resolution = None  # Resolution the pack was loaded (or failed to load) for
+_template_pack_lock = threading.Lock()
+
+def _get_template_pack():
+    """Get the template pack for the current monitor resolution, loading or rebuilding it once"""
+    global _template_pack, _template_pack_resolution
+    if not TEMPLATE_PACK_ENABLED:
+        return None
+    resolution = (MONITOR_WIDTH, MONITOR_HEIGHT)
+    with _template_pack_lock:
+        if _template_pack_resolution != resolution:
+            _template_pack = template_pack.load_pack(*resolution)
+            _template_pack_resolution = resolution
+        return _template_pack
+
+def clear_template_cache():
+    """Drop every cached template, e.g. after resolution or threshold config changed"""
+    global _template_cache_threshold_config
+    with _template_cache_lock:
+        _template_cache.clear()
+        _template_cache_threshold_config = None
+
+def _load_template(template_path, grayscale, scale_factor):
+    """Read a template from disk and resize it to the current screen scale"""
+    full_template_path = resource_path(template_path)
+    color_flag = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+    template = cv2.imread(full_template_path, color_flag)
+    if template is None:
+        raise FileNotFoundError(f"Template image '{full_template_path}' not found.")
+    
+    # Skip scaling for CustomFuse images - use them at their original resolution
+    if not is_custom_fuse_image(full_template_path):
+        template = cv2.resize(template, None, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_LINEAR)
+    return template
+
+def get_template(template_path, grayscale, scale_factor):
+    """Get (template, threshold_adjustment) for the template, decoding and resizing it only on cache miss.
+    
+    The cache is keyed by (path, colour mode, scale factor), evicts the least recently used entry
+    above TEMPLATE_CACHE_SIZE and is emptied when the image_thresholds config is reloaded. Images
+    derived from a template, like its coarse pyramid templates, are cached next to it.
+    """
+    key = (template_path, grayscale, scale_factor)
+    entry = _template_cache_get(key)
+    if entry is not None:
+        return entry
+    
+    pack = _get_template_pack()
+    template = pack.get(template_path, grayscale, scale_factor) if pack is not None else None
+    if template is None:
+        template = _load_template(template_path, grayscale, scale_factor)
+        template.flags.writeable = False  # Shared between callers
+    entry = (template, get_total_threshold_adjustment(template_path))
+    _template_cache_put(key, entry)
+    return entry
+
+def _template_cache_get(key):
+    """Look up a template cache entry and mark it as recently used, None on a miss"""
+    global _template_cache_threshold_config
+    with _template_cache_lock:
+        # The GUI swaps in a new dict when image_thresholds.json is reloaded
+        if _template_cache_threshold_config is not shared_vars.image_threshold_config:
+            _template_cache.clear()
+            _template_cache_threshold_config = shared_vars.image_threshold_config
+        entry = _template_cache.get(key)
+        if entry is not None:
+            _template_cache.move_to_end(key)
+        return entry
+
+def _template_cache_put(key, entry):
+    """Store a template cache entry, evicting the least recently used ones above TEMPLATE_CACHE_SIZE"""
+    with _template_cache_lock:
+        _template_cache[key] = entry
+        _template_cache.move_to_end(key)
+        while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+
 def get_total_threshold_adjustment(template_path):
     """Get combined threshold adjustment based on global, folder, and path-specific settings"""
     config = shared_vars.image_threshold_config
@@ -568,22 +1643,65 @@ def get_path_specific_adjustment(template_path):
     image_adjustments = config.get("image_adjustments", {})
     return image_adjustments.get(template_path, 0.0)
 
-def match_image(template_path, threshold=0.8, area="center",mousegoto200=False, grayscale=False, no_grayscale=False, debug=False, quiet_failure=False, x1=None, y1=None, x2=None, y2=None):
+DEFAULT_MATCH_THRESHOLD = 0.8  # Threshold of matches whose caller and manifest entry set none
+
+def get_template_region(template_path):
+    """Get the manifest entry for a template from template_regions.json.
+    
+    Image entries override the keys of the entry for their folder. Keys are
+    "roi" as [x1, y1, x2, y2] in 1080p reference coordinates, "grayscale" and "threshold".
+    """
+    config = shared_vars.template_region_config
+    region = dict(config.get("folder_regions", {}).get(os.path.dirname(template_path), {}))
+    region.update(config.get("image_regions", {}).get(template_path, {}))
+    return region
+
+def _apply_template_region(template_path, threshold, use_grayscale, no_grayscale, x1, y1, x2, y2):
+    """Fill in search region, colour mode and threshold from the template manifest.
+    
+    A region or threshold passed by the caller always wins over the manifest one and
+    no_grayscale still prevents any grayscale conversion. Without either threshold
+    DEFAULT_MATCH_THRESHOLD applies.
+    
+    Returns:
+        (threshold, use_grayscale, x1, y1, x2, y2)
+    """
+    region = get_template_region(template_path)
+    if threshold is None:
+        threshold = region.get("threshold", DEFAULT_MATCH_THRESHOLD)
+    if not region:
+        return threshold, use_grayscale, x1, y1, x2, y2
+    
+    if "roi" in region and None in (x1, y1, x2, y2):
+        roi_x1, roi_y1, roi_x2, roi_y2 = region["roi"]
+        x1, y1 = scale_coordinates_1080p(roi_x1, roi_y1)
+        x2, y2 = scale_coordinates_1080p(roi_x2, roi_y2)
+    if "grayscale" in region:
+        use_grayscale = region["grayscale"] and not no_grayscale
+    return threshold, use_grayscale, x1, y1, x2, y2
+
+def match_image(template_path, threshold=None, area="center",mousegoto200=False, grayscale=False, no_grayscale=False, debug=False, quiet_failure=False, x1=None, y1=None, x2=None, y2=None, single=False):
     """Finds the image specified and returns coordinates depending on area: center, bottom, left, right, top.
     
     Args:
         x1, y1, x2, y2: Optional region coordinates to limit search area. If provided, only searches within this rectangle.
+        single: Only the first coordinates are used, lets the learned region answer before the whole screen is searched
     """
     if mousegoto200:
         mouse_move(*scale_coordinates_1080p(200, 200))
-    return _base_match_template(template_path, threshold, grayscale, no_grayscale, debug, area, quiet_failure, x1, y1, x2, y2)
+    handled, found = _on_vision_worker("match_image", template_path=template_path, threshold=threshold, area=area,
+                                       grayscale=grayscale, no_grayscale=no_grayscale, debug=debug,
+                                       quiet_failure=quiet_failure, x1=x1, y1=y1, x2=x2, y2=y2, single=single)
+    if handled:
+        return found
+    return _base_match_template(template_path, threshold, grayscale, no_grayscale, debug, area, quiet_failure, x1, y1, x2, y2, single=single)
 
 def greyscale_match_image(template_path, threshold=0.75, area="center", no_grayscale=False, debug=False, quiet_failure=False, x1=None, y1=None, x2=None, y2=None):
     """Finds the image specified and returns the center coordinates, regardless of screen resolution,
     and saves screenshots of each match found."""
     return _base_match_template(template_path, threshold, grayscale=True, no_grayscale=no_grayscale, debug=debug, area=area, quiet_failure=quiet_failure, x1=x1, y1=y1, x2=x2, y2=y2)
 
-def debug_match_image(template_path, threshold=0.8, area="center", grayscale=False, no_grayscale=False, x1=None, y1=None, x2=None, y2=None):
+def debug_match_image(template_path, threshold=None, area="center", grayscale=False, no_grayscale=False, x1=None, y1=None, x2=None, y2=None):
     """Finds the image specified and returns the center coordinates, regardless of screen resolution,
        and draws rectangles on each match found."""
     return _base_match_template(template_path, threshold, grayscale=grayscale, no_grayscale=no_grayscale, debug=True, area=area, x1=x1, y1=y1, x2=x2, y2=y2)
@@ -720,55 +1838,6 @@ def get_resolution(monitor_index=None):
     mon = get_monitor_info(monitor_index)
     return mon['width'], mon['height']
 
-def non_max_suppression_fast(boxes, overlapThresh=0.5):
-    """Remove multiple detections on the same position"""
-    if len(boxes) == 0:
-        return []
-
-    # Convert to float if necessary
-    if boxes.dtype.kind == "i":
-        boxes = boxes.astype("float")
-
-    # Initialize the list of picked indexes
-    pick = []
-
-    # Get coordinates of bounding boxes
-    x1 = boxes[:, 0]
-    y1 = boxes[:, 1]
-    x2 = boxes[:, 2]
-    y2 = boxes[:, 3]
-
-    # Compute the area of the bounding boxes and sort by the bottom-right y-coordinate
-    area = (x2 - x1 + 1) * (y2 - y1 + 1)
-    idxs = np.argsort(y2)
-
-    # Keep looping while some indexes still remain in the indexes list
-    while len(idxs) > 0:
-        # Grab the last index in the indexes list, add the index value to the list of picked indexes
-        last = len(idxs) - 1
-        i = idxs[last]
-        pick.append(i)
-
-        # Find the largest (x, y) coordinates for the start of the bounding box
-        # and the smallest (x, y) coordinates for the end of the bounding box
-        xx1 = np.maximum(x1[i], x1[idxs[:last]])
-        yy1 = np.maximum(y1[i], y1[idxs[:last]])
-        xx2 = np.minimum(x2[i], x2[idxs[:last]])
-        yy2 = np.minimum(y2[i], y2[idxs[:last]])
-
-        # Compute the width and height of the bounding box
-        w = np.maximum(0, xx2 - xx1 + 1)
-        h = np.maximum(0, yy2 - yy1 + 1)
-
-        # Compute the ratio of overlap
-        overlap = (w * h) / area[idxs[:last]]
-
-        # Delete all indexes from the index list that have an overlap greater than the threshold
-        idxs = np.delete(idxs, np.concatenate(([last], np.where(overlap > overlapThresh)[0])))
-
-    # Return only the bounding boxes that were picked
-    return boxes[pick].astype("int")
-
 def get_aspect_ratio(monitor_index=None):
     """Get monitor aspect ratio (4:3, 16:9, 16:10, or None)"""
     width, height = get_resolution(monitor_index)
@@ -888,34 +1957,348 @@ def click_skip(times):
     for i in range(times):
         mouse_click()
 
-def wait_skip(img_path, threshold=0.8):
+# ==================== WAITING ====================
+
+WAIT_POLL_MIN = 0.05  # Seconds between checks right after the screen changed
+WAIT_POLL_MAX = 1.0  # Slowest check rate reached while the screen stays the same
+WAIT_POLL_BACKOFF = 1.5  # Growth of the check interval per unchanged check
+
+def wait_for(any_of=None, all_of=None, none_of=None, timeout=None, poll="adaptive", threshold=None):
+    """Wait until a screen condition is met without spinning a core.
+    
+    Fires when any template of any_of is on screen, or when every template of all_of is
+    and none of none_of is. Checks use the shared frame, so concurrent waiters and matches
+    don't capture twice, and are skipped while their region of the screen stays the same.
+    With a vision worker the frame comes from it, the checks still run in this process.
+    
+    Args:
+        timeout: Seconds to wait, None waits forever
+        poll: "adaptive" starts at WAIT_POLL_MIN and backs off up to WAIT_POLL_MAX while the
+              screen doesn't change, a number polls at that fixed interval in seconds
+    
+    Returns:
+        The any_of template that was found, True when the all_of/none_of condition is met, None on timeout
+    """
+    any_of = list(any_of or [])
+    all_of = list(all_of or [])
+    none_of = list(none_of or [])
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    interval = WAIT_POLL_MIN if poll == "adaptive" else poll
+    previous_thumbnail = None
+    
+    while True:
+        frame = get_frame()
+        
+        def on_screen(template):
+            return exists(template, threshold, quiet_failure=True, frame=frame, static_reuse=True)
+        
+        for template in any_of:
+            if on_screen(template):
+                return template
+        if (all_of or none_of) and all(on_screen(template) for template in all_of) and not any(on_screen(template) for template in none_of):
+            return True
+        
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.warning(f"Timed out after {timeout}s waiting for any of {any_of}, all of {all_of}, none of {none_of} - {_get_caller_info()}")
+            return None
+        
+        if poll == "adaptive":
+            thumbnail = frame.thumbnail
+            if previous_thumbnail is not None and not region_changed(previous_thumbnail, thumbnail):
+                interval = min(interval * WAIT_POLL_BACKOFF, WAIT_POLL_MAX)
+            else:
+                interval = WAIT_POLL_MIN
+            previous_thumbnail = thumbnail
+        if deadline is not None:
+            interval = max(0.0, min(interval, deadline - time.monotonic()))
+        time.sleep(interval)
+
+def wait_skip(img_path, threshold=None):
     """Clicks on the skip button and waits for specified element to appear"""
     mouse_move_click(*scale_coordinates_1080p(895, 465))
     while(not element_exist(img_path, threshold)):
         mouse_click()
     click_matching(img_path, threshold)
 
-def click_matching(image_path, threshold=0.8, area="center", mousegoto200=False, grayscale=False, no_grayscale=False, debug=False, recursive=True, x1=None, y1=None, x2=None, y2=None):
-    """Find and click on image match. Returns True if clicked, False if not found."""
-    found = ifexist_match(image_path, threshold, area,mousegoto200, grayscale, no_grayscale, debug, x1, y1, x2, y2)
-    if found:
-        x, y = found[0]
-        mouse_move_click(x, y, log_click=False)
-        # Handle both multiprocessing.Value and plain float
-        delay = shared_vars.click_delay.value if hasattr(shared_vars.click_delay, 'value') else shared_vars.click_delay
-        time.sleep(delay)
-        return True
-    elif recursive:
-        return click_matching(image_path, threshold, area, mousegoto200, grayscale=grayscale, no_grayscale=no_grayscale, debug=debug, x1=x1, y1=y1, x2=x2, y2=y2)
-    else:
-        return False
+# ==================== CONNECTION WATCHDOG ====================
+
+CONNECTION_INDICATOR = "pictures/general/connection.png"
+CONNECTION_CHECK_INTERVAL = 0.5  # Seconds between checks of the connection indicator
+CONNECTION_INDICATOR_REGION = (480, 270, 1440, 810)  # 1080p reference, the middle of the screen the overlay text is centred in with wide margins
+
+class ConnectionWatchdog:
+    """Watches the connection indicator from a low rate background thread.
     
-def element_exist(img_path, threshold=0.8, area="center",mousegoto200=False, grayscale=False, no_grayscale=False, debug=False, quiet_failure=False, x1=None, y1=None, x2=None, y2=None):
-    """Checks if the element exists if not returns none"""
-    result = match_image(img_path, threshold, area, mousegoto200, grayscale, no_grayscale, debug, quiet_failure, x1, y1, x2, y2)
-    return result
+    The connected event is set while no connection indicator is on screen. Checks
+    reuse the frame of the automation when it's recent enough and are skipped while
+    the indicator's region doesn't change, so the watchdog costs little on its own.
+    """
+
+    def __init__(self, interval=CONNECTION_CHECK_INTERVAL, roi=None):
+        """
+        Args:
+            interval: Seconds between checks
+            roi: Optional (x1, y1, x2, y2) region of the indicator in screen coordinates,
+                 otherwise template_regions.json or the learned region is used
+        """
+        self.interval = interval
+        self.roi = roi
+        self.connected = threading.Event()
+        self.connected.set()  # Start with connection assumed good
+        self.checks = 0
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Check the connection indicator once and update the connected event"""
+        x1, y1, x2, y2 = self.roi if self.roi else (None, None, None, None)
+        try:
+            frame = get_frame(max_age=self.interval)
+            connecting = exists(CONNECTION_INDICATOR, quiet_failure=True, x1=x1, y1=y1, x2=x2, y2=y2,
+                                frame=frame, static_reuse=True)
+        except Exception as e:
+            logger.error(f"Error in connection check: {e}")
+            return self.connected.is_set()
+        self.checks += 1
+        if connecting:
+            if self.connected.is_set():
+                logger.debug("Connection indicator on screen, pausing")
+            self.connected.clear()
+        else:
+            self.connected.set()
+        return not connecting
 
-def ifexist_match(img_path, threshold=0.8, area="center",mousegoto200=False, grayscale=False, no_grayscale=False, debug=False, x1=None, y1=None, x2=None, y2=None):
+    def start(self):
+        """Start the background checks, does nothing if they are already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="connection_watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background checks"""
+        self._stop.set()
+
+    def _run(self):
+        """Check the indicator every interval until stopped"""
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
+
+_connection_watchdog = None
+_connection_watchdog_lock = threading.Lock()
+
+def get_connection_watchdog():
+    """Get the connection watchdog shared by everything in this process"""
+    global _connection_watchdog
+    with _connection_watchdog_lock:
+        if _connection_watchdog is None:
+            x1, y1, x2, y2 = CONNECTION_INDICATOR_REGION
+            _connection_watchdog = ConnectionWatchdog(roi=(*scale_coordinates_1080p(x1, y1), *scale_coordinates_1080p(x2, y2)))
+        return _connection_watchdog
+
+# ==================== RETRY POLICY ====================
+
+RETRY_STORM_ATTEMPTS = 50  # Warn every this many failed attempts at the same click
+
+class RetryPolicy:
+    """How click_matching keeps looking for an image that isn't on screen yet"""
+
+    def __init__(self, max_attempts=None, deadline=None, initial_delay=0.05, max_delay=0.5, backoff=1.5, on_timeout=None):
+        """
+        Args:
+            max_attempts: Give up after this many attempts, None for no limit
+            deadline: Give up after this many seconds, None for no limit
+            initial_delay: Seconds to wait after the first miss
+            max_delay: Longest wait between attempts
+            backoff: Growth of the wait after every miss
+            on_timeout: Called as on_timeout(image_path, attempts) when giving up, e.g. to take an error screenshot
+        """
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.on_timeout = on_timeout
+
+    def delay(self, attempts):
+        """Seconds to wait after the given number of failed attempts"""
+        return min(self.initial_delay * self.backoff ** (attempts - 1), self.max_delay)
+
+    def exhausted(self, attempts, elapsed):
+        """Check if no more attempts are allowed"""
+        if self.max_attempts is not None and attempts >= self.max_attempts:
+            return True
+        return self.deadline is not None and elapsed >= self.deadline
+
+# Waits as long as it takes like the old recursive retry, but without spinning
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+_retry_stats = {}  # Template path -> attempt counters of click_matching
+_retry_stats_lock = threading.Lock()
+
+def _record_retry(image_path, attempts, timed_out=False):
+    """Count the attempts one click_matching call needed"""
+    with _retry_stats_lock:
+        stats = _retry_stats.setdefault(image_path, {"calls": 0, "attempts": 0, "max_attempts": 0, "timeouts": 0})
+        stats["calls"] += 1
+        stats["attempts"] += attempts
+        stats["max_attempts"] = max(stats["max_attempts"], attempts)
+        if timed_out:
+            stats["timeouts"] += 1
+
+def get_retry_stats():
+    """Get click_matching attempt counters per template"""
+    with _retry_stats_lock:
+        return {path: dict(stats) for path, stats in _retry_stats.items()}
+
+def click_matching(image_path, threshold=None, area="center", mousegoto200=False, grayscale=False, no_grayscale=False, debug=False, recursive=True, x1=None, y1=None, x2=None, y2=None, retry_policy=None):
+    """Find and click on image match. Returns True if clicked, False if not found.
+    
+    Args:
+        recursive: Keep retrying until the image shows up, following retry_policy
+        retry_policy: RetryPolicy for the retries, defaults to DEFAULT_RETRY_POLICY
+    """
+    policy = retry_policy or DEFAULT_RETRY_POLICY
+    start_time = time.monotonic()
+    attempts = 0
+    while True:
+        attempts += 1
+        # Only the first miss is logged, repeated ones are reported as retry storms
+        found = match_image(image_path, threshold, area, mousegoto200, grayscale, no_grayscale, debug, attempts > 1, x1, y1, x2, y2, single=True)
+        if found:
+            x, y = found[0]
+            mouse_move_click(x, y, log_click=False)
+            _click_delay()
+            _record_retry(image_path, attempts)
+            return True
+        if not recursive:
+            _record_retry(image_path, attempts)
+            return False
+        
+        if policy.exhausted(attempts, time.monotonic() - start_time):
+            logger.warning(f"Gave up clicking {image_path} after {attempts} attempts in {time.monotonic() - start_time:.1f}s - {_get_caller_info()}")
+            _record_retry(image_path, attempts, timed_out=True)
+            if policy.on_timeout is not None:
+                policy.on_timeout(image_path, attempts)
+            return False
+        if attempts % RETRY_STORM_ATTEMPTS == 0:
+            logger.warning(f"Still looking for {image_path} to click after {attempts} attempts ({time.monotonic() - start_time:.1f}s) - {_get_caller_info()}")
+        time.sleep(policy.delay(attempts))
+    
+def _click_delay():
+    """Wait the configured delay after clicking a match"""
+    # Handle both multiprocessing.Value and plain float
+    delay = shared_vars.click_delay.value if hasattr(shared_vars.click_delay, 'value') else shared_vars.click_delay
+    time.sleep(delay)
+
+def click_first_match(image_paths, threshold=None, area="center", grayscale=False, no_grayscale=False, x1=None, y1=None, x2=None, y2=None):
+    """Click the first image of the list that is on screen, checking all of them in one vision pass.
+    Returns the clicked image path or None if none was found."""
+    roi = (x1, y1, x2, y2) if x1 is not None else None
+    found = match_many(image_paths, roi=roi, threshold=threshold, area=area, grayscale=grayscale, no_grayscale=no_grayscale)
+    for image_path in image_paths:
+        if found[image_path]:
+            x, y = found[image_path][0]
+            mouse_move_click(x, y, log_click=False)
+            _click_delay()
+            return image_path
+    return None
+
+def _best_match_on_frame(frame, template_path, threshold, use_grayscale, x1=None, y1=None, x2=None, y2=None):
+    """Get the best match of a template on a frame.
+    
+    Returns:
+        (highest_match_rate, threshold, box, crop_offset_x, crop_offset_y) where box is the best
+        scoring box relative to the searched region and threshold has all adjustments applied
+    """
+    result, threshold, (template_width, template_height), crop_offset_x, crop_offset_y = _score_on_frame(
+        frame, template_path, threshold, use_grayscale, x1, y1, x2, y2)
+    if result.size == 0:
+        return 0.0, threshold, None, crop_offset_x, crop_offset_y
+    _, highest_match_rate, _, (best_x, best_y) = cv2.minMaxLoc(result)
+    box = (best_x, best_y, best_x + template_width, best_y + template_height)
+    return highest_match_rate, threshold, box, crop_offset_x, crop_offset_y
+
+def exists(template_path, threshold=None, grayscale=False, no_grayscale=False, quiet_failure=False, x1=None, y1=None, x2=None, y2=None, frame=None, static_reuse=False):
+    """Checks if the template is on screen using only the best match score.
+    
+    Skips box extraction and non-max suppression, so it's cheaper than match_image
+    when the coordinates aren't needed.
+    
+    Args:
+        frame: Frame to check, defaults to the shared frame from get_frame()
+        static_reuse: Reuse the previous result of the same check when its region of the screen
+                      hasn't changed since, meant for polling loops
+    """
+    if frame is None:
+        handled, found = _on_vision_worker("exists", template_path=template_path, threshold=threshold, grayscale=grayscale,
+                                           no_grayscale=no_grayscale, quiet_failure=quiet_failure,
+                                           x1=x1, y1=y1, x2=x2, y2=y2, static_reuse=static_reuse)
+        if handled:
+            return found
+    
+    use_grayscale = not no_grayscale and (grayscale or shared_vars.convert_images_to_grayscale)
+    threshold, use_grayscale, x1, y1, x2, y2 = _apply_template_region(
+        template_path, threshold, use_grayscale, no_grayscale, x1, y1, x2, y2)
+    if frame is None:
+        frame = get_frame()
+    
+    if static_reuse:
+        static_key = (template_path, threshold, use_grayscale, x1, y1, x2, y2)
+        thumbnail = _thumbnail_region(frame, x1, y1, x2, y2)
+        with _static_results_lock:
+            previous = _static_results.get(static_key)
+            if previous is not None and not region_changed(previous[0], thumbnail):
+                _change_stats["skipped"] += 1
+                _static_results.move_to_end(static_key)
+                return previous[1]
+    
+    # Without a given region, try where the template was seen before
+    learn = None in (x1, y1, x2, y2)
+    frame_height, frame_width = frame.shape
+    region = _get_learned_region(template_path, frame_width, frame_height) if learn and LEARNED_REGIONS_ENABLED else None
+    outcome = None
+    if region is not None:
+        best = _best_match_on_frame(frame, template_path, threshold, use_grayscale, *region)
+        outcome = "hits" if best[0] >= best[1] else "misses"
+    if region is None or outcome == "misses":
+        best = _best_match_on_frame(frame, template_path, threshold, use_grayscale, x1, y1, x2, y2)
+    highest_match_rate, threshold, box, crop_offset_x, crop_offset_y = best
+    found = highest_match_rate >= threshold
+    if learn:
+        _record_match_location(template_path, [box] if found else [], crop_offset_x, crop_offset_y,
+                               frame_width, frame_height, outcome)
+    
+    if static_reuse:
+        with _static_results_lock:
+            _static_results[static_key] = (thumbnail, found)
+            _static_results.move_to_end(static_key)
+            while len(_static_results) > STATIC_REUSE_CACHE_SIZE:
+                _static_results.popitem(last=False)
+            _change_stats["evaluated"] += 1
+    
+    if not quiet_failure:
+        caller_info = _get_caller_info()
+        if found:
+            logger.debug(f"Match found: {template_path} - {caller_info}. Highest match rate: {highest_match_rate}", dirty=True)
+        else:
+            logger.debug(f"Match not found: {template_path} - {caller_info}. Highest match rate: {highest_match_rate}", dirty=True)
+    return found
+
+def element_exist(img_path, threshold=None, area="center",mousegoto200=False, grayscale=False, no_grayscale=False, debug=False, quiet_failure=False, x1=None, y1=None, x2=None, y2=None, static_reuse=False):
+    """Checks if the element exists, returns True or False. See exists() for static_reuse."""
+    if debug or shared_vars.debug_image_matches:
+        # Debug outlines need the matched boxes
+        return bool(match_image(img_path, threshold, area, mousegoto200, grayscale, no_grayscale, debug, quiet_failure, x1, y1, x2, y2, single=True))
+    if mousegoto200:
+        mouse_move(*scale_coordinates_1080p(200, 200))
+    return exists(img_path, threshold, grayscale, no_grayscale, quiet_failure, x1, y1, x2, y2, static_reuse=static_reuse)
+
+def ifexist_match(img_path, threshold=None, area="center",mousegoto200=False, grayscale=False, no_grayscale=False, debug=False, x1=None, y1=None, x2=None, y2=None):
     """checks if exists and returns the image location if found"""
     result = match_image(img_path, threshold, area,mousegoto200, grayscale, no_grayscale, debug, False, x1, y1, x2, y2)
     return result
@@ -926,21 +2309,9 @@ def squad_order(status):
     squads = shared_vars.ConfigCache.get_config("squad_order")
     squad = squads.get(status, {})
     
-    # Calculate scaled character positions directly
-    character_positions = {
-        "yisang": (580, 500),
-        "faust": (847, 500),
-        "donquixote": (1113, 500),
-        "ryoshu": (1380, 500),
-        "meursault": (1647, 500),
-        "honglu": (1913, 500),
-        "heathcliff": (580, 900),
-        "ishmael": (847, 900),
-        "rodion": (1113, 900),
-        "sinclair": (1380, 900),
-        "outis": (1647, 900),
-        "gregor": (1913, 900)
-    }
+    # Positions are scaled once per resolution by the layout
+    import layout
+    character_positions = layout.get_layout().coord_set("squad_positions")
     
     # Create reverse lookup for O(n) performance
     position_to_char = {pos: name for name, pos in squad.items()}
@@ -949,42 +2320,62 @@ def squad_order(status):
     for i in range(1, 13):
         char_name = position_to_char.get(i)
         if char_name and char_name in character_positions:
-            base_x, base_y = character_positions[char_name]
-            scaled_x, scaled_y = scale_coordinates_1440p(base_x, base_y)
-            sinner_order.append((scaled_x, scaled_y))
+            sinner_order.append(character_positions[char_name])
     
     return sinner_order
 
+def sample_pixels(points, frame=None, radius=0):
+    """Get the luminence of many screen points from one frame.
+    
+    Args:
+        points: (x, y) screen coordinates, clamped to the frame
+        frame: Frame to read, defaults to the shared frame from get_frame()
+        radius: Average a (2 * radius + 1) square patch around each point instead of one pixel
+    
+    Returns:
+        Array with the mean of the three colour channels for every point
+    """
+    if frame is None:
+        frame = get_frame()
+    image = frame.pixels
+    height, width = frame.shape
+    points = np.asarray(points, dtype=np.intp).reshape(-1, 2)
+    offsets = np.arange(-radius, radius + 1)
+    # Every pixel of every patch is gathered with one fancy index: shape (points, patch rows, patch cols, channels)
+    xs = np.clip(points[:, 0, None, None] + offsets[None, None, :], 0, width - 1)
+    ys = np.clip(points[:, 1, None, None] + offsets[None, :, None], 0, height - 1)
+    return image[ys, xs, :3].mean(axis=(1, 2, 3))
+
 def luminence(x,y):
     """Get Luminence of the pixel and return overall coefficient"""
-    screenshot = capture_screen()
-    pixel_image = screenshot[y, x]
-    coeff = (int(pixel_image[0]) + int(pixel_image[1]) + int(pixel_image[2])) / 3
-    return coeff
+    return float(sample_pixels([(x, y)])[0])
 
 def error_screenshot():
     """Take a screenshot for error debugging"""
     error_dir = os.path.join(BASE_PATH, "error")
     os.makedirs(error_dir, exist_ok=True)
-    with mss() as sct:
-        monitor = sct.monitors[shared_vars.game_monitor]  # Use the configured game monitor
-        screenshot = sct.grab(monitor)
-        png = to_png(screenshot.rgb, screenshot.size)
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        with open(os.path.join(error_dir, timestamp + ".png"), "wb") as f:
-            f.write(png)
+    sct = get_capture_session()
+    monitor = get_monitor_info()  # Use the configured game monitor
+    screenshot = sct.grab(monitor)
+    png = to_png(screenshot.rgb, screenshot.size)
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    with open(os.path.join(error_dir, timestamp + ".png"), "wb") as f:
+        f.write(png)
 
 def set_game_monitor(monitor_index):
     """Set which monitor the game is running on"""
-    with mss() as sct:
-        if monitor_index < 1 or monitor_index >= len(sct.monitors):
-            logger.warning(f"Invalid monitor index {monitor_index} (valid: 1-{len(sct.monitors)-1})")
-            shared_vars.game_monitor = 1
-        else:
-            shared_vars.game_monitor = monitor_index
+    # Monitor layout may have changed since the grabbers were opened
+    reset_capture_sessions()
+    monitor_count = len(refresh_monitor_geometry())
+    if monitor_index < 1 or monitor_index >= monitor_count:
+        logger.warning(f"Invalid monitor index {monitor_index} (valid: 1-{monitor_count-1})")
+        shared_vars.game_monitor = 1
+    else:
+        shared_vars.game_monitor = monitor_index
     
     # Re-detect monitor resolution after changing monitor
     detect_monitor_resolution()
+    clear_template_cache()
     return shared_vars.game_monitor
 
 def list_available_monitors():
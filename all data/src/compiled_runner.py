@@ -1,6 +1,7 @@
 import sys
 import logging
 import os
+import signal
 import threading
 import json
 import mirror
@@ -80,26 +81,15 @@ class ConnectionManager:
     """Manages connection checking and reconnection"""
     
     def __init__(self):
-        self.connection_event = threading.Event()
-        self.connection_event.set()  # Start with connection assumed good
+        from common import get_connection_watchdog
+        
+        # Shared watchdog, its event is set while the connection is good
+        self.watchdog = get_connection_watchdog()
+        self.connection_event = self.watchdog.connected
     
     def start_connection_monitor(self):
         """Start the connection monitoring thread"""
-        connection_thread = threading.Thread(target=self._connection_check, daemon=True)
-        connection_thread.start()
-    
-    def _connection_check(self):
-        """Monitor connection status"""
-        from common import element_exist
-        
-        while True:
-            try:
-                if element_exist("pictures/general/connection.png", quiet_failure=True):
-                    self.connection_event.clear()
-                else:
-                    self.connection_event.set()
-            except Exception as e:
-                logger.error(f"Error in connection check: {e}")
+        self.watchdog.start()
     
     def handle_reconnection(self):
         """Handle reconnection when needed"""
@@ -180,11 +170,30 @@ def mirror_dungeon_run(num_runs, status_list_file, connection_manager, shared_va
         from common import error_screenshot
         error_screenshot()
 
+def flush_learned_regions():
+    """Write learned template regions gathered since the last periodic save"""
+    try:
+        import common
+        common.save_learned_regions(force=True)
+    except Exception as e:
+        if logger:
+            logger.debug(f"Could not flush learned regions: {e}")
+
 def setup_logging(base_path):
     """Logging configuration is handled by common.py"""
     pass
 
+def signal_handler(sig, frame):
+    """Handle termination signals"""
+    if logger:
+        logger.warning(f"Termination signal received, shutting down...")
+    sys.exit(0)
+
 def main(num_runs, shared_vars):
+    # Register signal handlers so the GUI stopping the run still flushes learned regions
+    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGINT, signal_handler)
+    
     try:
         base_path, status_path = setup_paths_and_imports()
         
@@ -197,6 +206,9 @@ def main(num_runs, shared_vars):
         connection_manager = ConnectionManager()
         connection_manager.start_connection_monitor()
         
+        import vision_worker
+        vision_worker.start_if_enabled()
+        
         mirror_dungeon_run(num_runs, status_list_file, connection_manager, shared_vars)
         logger.info(f"mirror_dungeon_run completed successfully")
         
@@ -208,6 +220,8 @@ def main(num_runs, shared_vars):
         except:
             pass  # Don't let screenshot errors crash the main error handler
         return  # Return instead of sys.exit for multiprocessing
+    finally:
+        flush_learned_regions()
 
 if __name__ == "__main__":
     """Legacy support for command line execution"""
@@ -262,6 +276,9 @@ if __name__ == "__main__":
         connection_manager = ConnectionManager()
         connection_manager.start_connection_monitor()
         
+        import vision_worker
+        vision_worker.start_if_enabled()
+        
         mirror_dungeon_run(count, status_list_file, connection_manager, fake_shared_vars)
         logger.info(f"mirror_dungeon_run completed successfully")
         
@@ -273,5 +290,7 @@ if __name__ == "__main__":
         except:
             pass
         sys.exit(1)  # Exit with error code for command line
+    finally:
+        flush_learned_regions()
     
     logger.info(f"compiled_runner.py completed successfully")
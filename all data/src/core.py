@@ -8,6 +8,8 @@ import pyautogui
 
 import common
 import shared_vars
+from screen_state import ScreenState, BATTLE_CLASSIFIER
+from layout import get_layout
 
 
 def get_base_path():
@@ -70,8 +72,7 @@ def pre_md_setup():
 def check_loading():
     """Wait for loading screens to finish"""
     common.sleep(2)
-    while(common.element_exist("pictures/general/loading.png")):
-        common.sleep(0.5)
+    common.wait_for(none_of=["pictures/general/loading.png"])
 
 def transition_loading():
     """Wait for transitions between screens"""
@@ -79,8 +80,7 @@ def transition_loading():
 
 def post_run_load():
     """Wait for return to main menu after run completion"""
-    while(not common.element_exist("pictures/general/module.png")):
-        common.sleep(1)
+    common.wait_for(any_of=["pictures/general/module.png"])
 
 def reconnect():
     """Handle server disconnections and retry connection"""
@@ -88,13 +88,13 @@ def reconnect():
         if shared_vars.reconnect_when_internet_reachable:
             if common.check_internet_connection():
                 common.click_matching("pictures/general/retry.png")
-                common.mouse_move(*common.scale_coordinates_1080p(200,200))
+                common.mouse_move(*get_layout().mouse_rest)
             else:
                 common.sleep(1)
         else:
             common.sleep(shared_vars.reconnection_delay)
             common.click_matching("pictures/general/retry.png")
-            common.mouse_move(*common.scale_coordinates_1080p(200,200))
+            common.mouse_move(*get_layout().mouse_rest)
     if common.element_exist("pictures/general/no_op.png"):
         common.click_matching("pictures/general/close.png")
         logger.critical("COULD NOT RECONNECT TO THE SERVER. SHUTTING DOWN!")
@@ -110,14 +110,19 @@ def battle():
     winrate_invisible_timeout = 10
     
     while(battle_finished != 1):
-        if common.element_exist("pictures/general/server_error.png"):
+        # Cursor parked in the corner first so it can't cover any of the cues below
+        common.mouse_move(*get_layout().battle_mouse_rest)
+        _, screen = BATTLE_CLASSIFIER.classify()
+
+        if screen[ScreenState.SERVER_ERROR]:
             logger.warning("Server error detected during battle")
             common.mouse_up()
             reconnect()
+            continue
 
-        if common.element_exist("pictures/general/loading.png") and not common.element_exist("pictures/CustomAdded1080p/battle/setting_cog.png"): #Checks for loading screen to end the while loop
+        if screen[ScreenState.LOADING] and not screen[ScreenState.BATTLE_SETTINGS]: #Checks for loading screen to end the while loop
             common.mouse_up()
-            if common.element_exist("pictures/battle/winrate.png"):
+            if screen[ScreenState.BATTLE]:
                 logger.info("false read loading")
                 battle()
                 return
@@ -126,8 +131,7 @@ def battle():
             logger.info(f"Battle finished!")
             return
             
-        common.mouse_move(*common.scale_coordinates_1080p(20, 1060))
-        if common.element_exist("pictures/events/skip.png"): #Checks for special battle skill checks prompt then calls skill check functions
+        if screen[ScreenState.EVENT]: #Checks for special battle skill checks prompt then calls skill check functions
             logger.debug("Skip button found, handling skill check")
             common.mouse_up()
             while(True):
@@ -142,8 +146,10 @@ def battle():
                     break
 
                 common.click_matching("pictures/events/continue.png", recursive=False)
+            # Screen changed while handling the event, classify it again
+            continue
                     
-        if common.element_exist("pictures/battle/winrate.png"):
+        if screen[ScreenState.BATTLE]:
             logger.debug("Winrate screen detected")
             winrate_invisible_start = None
             current_time = time.time()
@@ -168,10 +174,10 @@ def battle():
                 common.mouse_down()
                 time.sleep(1)
                 if not common.element_exist("pictures/CustomAdded1080p/battle/battle_in_progress.png"):
-                    common.mouse_move_click(*common.scale_coordinates_1080p(20, 1060))
+                    common.mouse_move_click(*get_layout().battle_mouse_rest)
 
         else:
-            if common.element_exist("pictures/mirror/general/encounter_reward.png"):
+            if screen[ScreenState.ENCOUNTER_REWARD]:
                 battle_finished = 1
                 logger.info(f"battle ended, in mirror")
                 return
@@ -185,7 +191,7 @@ def battle():
                 winrate_invisible_start = None
                 logger.debug(f"No winrate for {winrate_invisible_timeout} seconds")
                 common.mouse_up()
-                common.mouse_move_click(*common.scale_coordinates_1080p(20, 1060))
+                common.mouse_move_click(*get_layout().battle_mouse_rest)
 
 def ego_check():
     """Check for bad clashes and use EGO skills to counter them"""
@@ -208,23 +214,23 @@ def ego_check():
     bad_clashes = [i for i in bad_clashes if i]
     if len(bad_clashes):
         logger.debug(f"Processing {len(bad_clashes)} bad clashes for EGO usage")
-        bad_clashes = [x for x in bad_clashes if x[1] > common.scale_y(1023)]
+        layout = get_layout()
+        bad_clashes = [x for x in bad_clashes if x[1] > layout.y["bad_clash_min"]]
         for x,y in bad_clashes:
             usable_ego = []
-            offset_x, offset_y = common.scale_offset_1440p(-55, 100)
+            offset_x, offset_y = layout.bad_clash_ego
             common.mouse_move(x + offset_x, y + offset_y)
             common.mouse_hold()
             egos = common.match_image("pictures/battle/ego/sanity.png")
-            for i in egos:
-                x,y = i
-                if common.luminence(x,y) > 100:
-                    usable_ego.append(i)
+            if egos:
+                # One frame read for every sanity icon
+                usable_ego = [ego for ego, lum in zip(egos, common.sample_pixels(egos)) if lum > 100]
             if len(usable_ego):
                 ego = common.random_choice(usable_ego)
                 x,y = ego
                 if common.element_exist("pictures/battle/ego/sanity.png"):
                     logger.info("Using EGO to counter bad clash")
-                    offset_x, offset_y = common.scale_offset_1440p(30, 30)
+                    offset_x, offset_y = layout.ego_sanity_click
                     common.mouse_move_click(x + offset_x, y + offset_y)
                     common.sleep(0.3)
                     common.mouse_click()
@@ -232,7 +238,7 @@ def ego_check():
             else:
                 logger.warning("No usable EGO found for bad clash")
                 if common.element_exist("pictures/battle/ego/sanity.png"):
-                    common.mouse_move_click(*common.scale_coordinates_1080p(20, 1060))
+                    common.mouse_move_click(*get_layout().battle_mouse_rest)
                     common.sleep(1)
         common.key_press("p")
         if not shared_vars.good_pc_mode:
@@ -259,13 +265,13 @@ def battle_check():
         logger.info("WOPPILY PT2")
         for i in range(3):
             common.click_matching("pictures/battle/NO.png")
-            common.mouse_move_click(*common.scale_coordinates_1440p(1193, 623))
+            common.mouse_move_click(*get_layout().event_choice)
             while(not common.element_exist("pictures/events/proceed.png")):
                 if common.click_matching("pictures/events/continue.png", recursive=False):
                     return 0
                 common.mouse_click()
             common.click_matching("pictures/events/proceed.png")
-            common.mouse_move_click(*common.scale_coordinates_1440p(1193, 623))
+            common.mouse_move_click(*get_layout().event_choice)
             while(not common.element_exist("pictures/battle/NO.png")):
                 common.mouse_click()
 
@@ -296,7 +302,7 @@ def battle_check():
         found = common.match_image("pictures/battle/offer_clay.png")
         if found:
             x,y = found[0]
-            _, offset_y = common.scale_offset_1440p(0, -72)
+            _, offset_y = get_layout().offer_clay_probe
             if common.luminence(x, y + offset_y) < 195:
                 common.click_matching("pictures/battle/offer_clay.png")
                 common.wait_skip("pictures/events/continue.png")
@@ -337,13 +343,11 @@ def skill_check():
     
     common.wait_skip("pictures/events/skill_check.png")
     common.sleep(1)
-    for i in check_images:
-        if common.click_matching(i, threshold=0.9, recursive=False):
-            break
+    common.click_first_match(check_images, threshold=0.9)
 
     common.click_matching("pictures/events/commence.png")
     common.sleep(3)
-    common.mouse_move_click(*common.scale_coordinates_1440p(1193, 623))
+    common.mouse_move_click(*get_layout().event_choice)
     while(True):
         common.mouse_click()
         if common.click_matching("pictures/events/proceed.png", recursive=False):
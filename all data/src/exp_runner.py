@@ -33,26 +33,15 @@ class ConnectionManager:
     
     def __init__(self):
         """Initialize connection manager"""
-        self.connection_event = threading.Event()
-        self.connection_event.set()  # Start with connection assumed good
+        from common import get_connection_watchdog
+        
+        # Shared watchdog, its event is set while the connection is good
+        self.watchdog = get_connection_watchdog()
+        self.connection_event = self.watchdog.connected
     
     def start_connection_monitor(self):
         """Start the connection monitoring thread"""
-        connection_thread = threading.Thread(target=self._connection_check, daemon=True)
-        connection_thread.start()
-    
-    def _connection_check(self):
-        """Monitor connection status"""
-        from common import element_exist
-        
-        while True:
-            try:
-                if element_exist("pictures/general/connection.png", quiet_failure=True):
-                    self.connection_event.clear()
-                else:
-                    self.connection_event.set()
-            except Exception as e:
-                logger.error(f"Error in connection check: {e}")
+        self.watchdog.start()
     
     def handle_reconnection(self):
         """Handle reconnection when needed"""
@@ -95,6 +84,9 @@ def main(runs, stage, shared_vars=None):
         # Initialize connection manager
         connection_manager = ConnectionManager()
         connection_manager.start_connection_monitor()
+        
+        import vision_worker
+        vision_worker.start_if_enabled()
        
         luxcavation_functions.pre_exp_setup(stage, SelectTeam=True, config_type="exp_team_selection")
         runs = runs - 1
@@ -133,6 +125,9 @@ def main(runs, stage, shared_vars=None):
     except Exception as e:
         logger.critical(f"Critical error in Exp runner: {e}")
         return 1
+    finally:
+        # Learned template regions gathered since the last periodic save
+        common.save_learned_regions(force=True)
    
     return 0
 
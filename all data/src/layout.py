@@ -0,0 +1,228 @@
+"""
+Layout - every scaled UI anchor point for the current resolution
+
+Anchor points are written at the reference resolution they were measured at and
+scaled once per monitor size and offset into an immutable Layout. A new Layout
+replaces the old one as a whole when the monitor or the offsets change, so a
+reader holding a Layout never sees a mix of old and new coordinates.
+"""
+import logging
+import threading
+from types import MappingProxyType
+import common
+import shared_vars
+
+logger = logging.getLogger(__name__)
+
+# ==================== ANCHOR POINTS ====================
+
+# (x, y) points in 1080p reference coordinates
+POINTS_1080P = {
+    "mouse_rest": (200, 200),  # Parks the cursor away from buttons and tooltips
+    "mouse_corner": (50, 50),  # Empty corner, also closes rest shop popups
+    "battle_mouse_rest": (20, 1060),  # Bottom left corner clear of every battle cue
+    "to_battle": (1722, 881),  # Squad selection to battle button
+}
+
+# (x, y) points in 1440p reference coordinates
+POINTS_1440P = {
+    "event_choice": (1193, 623),  # First choice of event dialogs
+    "fusion_keyword": (730, 700),  # Keyword dropdown of fusion
+}
+
+# (x, y) relative offsets in 1440p reference coordinates, without 16:9 padding
+OFFSETS_1440P = {
+    "gift_select_scroll": (-1365, 50),  # From gift_select to the gift list
+    "gift_list_first": (0, 235),  # From gift_select to the first gift
+    "gift_list_second": (0, 190),  # From the first gift to the second
+    "gift_list_third": (0, 380),  # From the first gift to the third
+    "squad_scroll": (90, 90),  # From squad_select to the squad list
+    "pack_click": (0, -350),  # From a pack match to its draggable card
+    "selectable_pack_click": (-100, 150),  # From inpack to its draggable card
+    "danteh_drag": (0, 100),
+    "market_purchased_probe": (25, 1),  # Dark once a market gift is purchased
+    "bad_clash_ego": (-55, 100),  # From a bad clash to its EGO button
+    "ego_sanity_click": (30, 30),
+    "offer_clay_probe": (0, -72),
+}
+
+# (x1, y1, x2, y2) regions in 1080p reference coordinates
+REGIONS_1080P = {
+    "pack_area": (150, 260, 1730, 800),  # Pack cards, detections outside are noise
+    "reward_area": (360, 225, 1555, 845),  # Reward cards of reward and encounter reward select
+    "rest_shop_gifts": (900, 300, 1700, 800),  # Owned gift grid of fusion and enhancement
+}
+
+# Single coordinates in 1440p reference, scaled like scale_x and scale_y
+X_1440P = {
+    "gift_list": 1640,  # Column of the starting gift choices
+    "owned_reward_shift": 200,  # From an owned tag to its acquire button
+    "combat_node_min": 1280,
+    "combat_node_max": 1601,
+    "combat_node_fuse": 100,
+    "fusion_duplicate": 10,
+    "fusion_gift_min": 1235,
+    "market_min": 1091,
+    "market_max": 2322,
+    "market_skill_replacement": 1300,
+    "enhance_gift_min": 1200,
+    "map_node": 1440,  # Column of the next map nodes, their y depends on the aspect ratio
+}
+
+Y_1440P = {
+    "pierce_pack_min": 1092,
+    "combat_node_fuse": 200,
+    "fusion_duplicate": 348,
+    "fusion_gift_max": 800,
+    "market_min": 434,
+    "market_max": 919,
+    "market_skill_replacement": 541,
+    "bad_clash_min": 1023,
+}
+
+# Single coordinates in 1080p reference, scaled like scale_x_1080p and scale_y_1080p
+X_1080P = {
+    "pack_proximity": 150,  # Pack to except pack
+    "owned_pack_proximity": 50,  # Status gift to owned tag
+    "status_pack_proximity": 432,  # Pack to status gift
+    "owned_reward_proximity": 150,
+    "reward_proximity": 200,
+    "upgraded_gift_expand": 100,
+}
+
+Y_1080P = {
+    "upgraded_gift_expand": 100,
+}
+
+GRACE_OF_STARS = {
+    "star of the beniggening": (300, 350),
+    "cumulating starcloud": (600, 350),
+    "interstellar travel": (900, 350),
+    "star shower": (1200, 350),
+    "binary star shop": (1500, 350),
+    "moon star shop": (300, 650),
+    "favor of the nebula": (600, 650),
+    "starlight guidance": (900, 650),
+    "chance comet": (1200, 650),
+    "perfected possibility": (1500, 650)
+}
+
+# Squad selection grid in 1440p reference coordinates
+CHARACTER_POSITIONS = {
+    "yisang": (580, 500),
+    "faust": (847, 500),
+    "donquixote": (1113, 500),
+    "ryoshu": (1380, 500),
+    "meursault": (1647, 500),
+    "honglu": (1913, 500),
+    "heathcliff": (580, 900),
+    "ishmael": (847, 900),
+    "rodion": (1113, 900),
+    "sinclair": (1380, 900),
+    "outis": (1647, 900),
+    "gregor": (1913, 900)
+}
+
+LUXCAVATION_POINTS_1080P = {
+    "latest_stage": (1613, 715),  # EXP latest stage click
+    "exp_drag_start": (397, 48),  # EXP drag movements
+    "exp_drag_end": (1920, 48),
+    "exp_drag_middle": (1152, 48),
+    "thread_select": (564, 722),  # Thread selection
+    "latest_difficulty": (925, 725),  # Latest difficulty
+}
+
+# ==================== LAYOUT ====================
+
+class Layout:
+    """Immutable set of anchor points scaled to one monitor size and offset.
+
+    Points, offsets, regions and single coordinates are read as attributes, e.g.
+    layout.mouse_rest or layout.pack_area, named coordinate sets with coord_set().
+    Single coordinates are split by axis as layout.x[name] and layout.y[name],
+    column_point() and offset() scale values only known at runtime.
+    """
+
+    def __init__(self, key):
+        values = {}
+        for name, (x, y) in POINTS_1080P.items():
+            values[name] = common.scale_coordinates_1080p(x, y)
+        for name, (x, y) in POINTS_1440P.items():
+            values[name] = common.scale_coordinates_1440p(x, y)
+        for name, (x, y) in OFFSETS_1440P.items():
+            values[name] = common.scale_offset_1440p(x, y)
+        for name, (x1, y1, x2, y2) in REGIONS_1080P.items():
+            values[name] = (*common.scale_coordinates_1080p(x1, y1), *common.scale_coordinates_1080p(x2, y2))
+        x = {name: common.scale_x(value) for name, value in X_1440P.items()}
+        x.update({name: common.scale_x_1080p(value) for name, value in X_1080P.items()})
+        y = {name: common.scale_y(value) for name, value in Y_1440P.items()}
+        y.update({name: common.scale_y_1080p(value) for name, value in Y_1080P.items()})
+
+        coord_sets = {
+            "grace_of_stars": {name: common.scale_coordinates_1080p(*point) for name, point in GRACE_OF_STARS.items()},
+            # Squad clicks use the 16:9 padded scaling of squad_order
+            "squad_positions": {name: common.scale_coordinates_1440p(*point) for name, point in CHARACTER_POSITIONS.items()},
+            "character_positions": {name: common._uniform_scale_coordinates(*point, common.REFERENCE_WIDTH_1440P,
+                                                                            common.REFERENCE_HEIGHT_1440P, use_uniform=False)
+                                    for name, point in CHARACTER_POSITIONS.items()},
+            "battle_buttons": {"to_battle": values["to_battle"]},
+            "luxcavation_coords": {**{name: common.scale_coordinates_1080p(*point) for name, point in LUXCAVATION_POINTS_1080P.items()},
+                                   "squad_scroll_offset": common.scale_coordinates_1440p(90, 90)},
+        }
+
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "_values", MappingProxyType(values))
+        object.__setattr__(self, "x", MappingProxyType(x))
+        object.__setattr__(self, "y", MappingProxyType(y))
+        object.__setattr__(self, "_coord_sets", MappingProxyType(
+            {name: MappingProxyType(coords) for name, coords in coord_sets.items()}))
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"Layout has no anchor point {name!r}") from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Layout is immutable, build a new one instead")
+
+    def column_point(self, x_name, y):
+        """Get the point on a named 1440p reference column at a 1440p reference y"""
+        return self.x[x_name], common.scale_y(y)
+
+    def offset(self, x, y):
+        """Scale a (x, y) offset in 1440p reference coordinates, without 16:9 padding"""
+        return common.scale_offset_1440p(x, y)
+
+    def coord_set(self, name):
+        """Get a named coordinate set as a read-only name -> (x, y) mapping"""
+        return self._coord_sets.get(name, MappingProxyType({}))
+
+_layout = None
+_layout_lock = threading.Lock()
+
+def _layout_key():
+    """Everything the scaled coordinates depend on"""
+    return (common.MONITOR_WIDTH, common.MONITOR_HEIGHT, common.EXPECTED_WIDTH, common.EXPECTED_HEIGHT,
+            common.IS_NON_STANDARD_RATIO, shared_vars.x_offset, shared_vars.y_offset)
+
+def get_layout():
+    """Get the Layout of the current monitor and offsets, rebuilt only when one of them changed"""
+    layout = _layout
+    key = _layout_key()
+    if layout is not None and layout.key == key:
+        return layout
+    return rebuild_layout(key)
+
+def rebuild_layout(key=None):
+    """Build a Layout for the current settings and swap it in"""
+    global _layout
+    key = key or _layout_key()
+    with _layout_lock:
+        if _layout is None or _layout.key != key:
+            # Readers keep using the old Layout until this single assignment
+            _layout = Layout(key)
+            logger.debug(f"Built layout for {key[0]}x{key[1]} with offset ({key[5]}, {key[6]})")
+        return _layout
@@ -12,6 +12,8 @@ import mirror
 import mirror_utils
 import pyautogui
 import shared_vars
+from screen_state import ScreenState, LUX_CONTINUE_CLASSIFIER
+from layout import get_layout
 
 # Determine if running as executable or script
 def get_base_path():
@@ -140,16 +142,18 @@ def click_continue():
     continue_clicked = False
 
     while time.time() - start_time < 60:  # 60 second maximum check time
+        state, _ = LUX_CONTINUE_CLASSIFIER.classify()
         
-        if common.click_matching("pictures/CustomAdded1080p/luxcavation/thread/confirminverted.png", recursive=False):
-            logger.info(f"Confirmation dialog found, clicked it")
-            common.mouse_move(*common.scale_coordinates_1080p(200, 200))
-            logger.info(f"clicked comfirm")
-            continue_clicked = True
-        elif common.click_matching("pictures/general/confirm_w.png", recursive=False):
-            pass
-            time.sleep(0.5)
-        elif common.element_exist("pictures/CustomAdded1080p/battle/in_battle_area.png"):
+        if state == ScreenState.CONFIRM:
+            if common.click_matching("pictures/CustomAdded1080p/luxcavation/thread/confirminverted.png", recursive=False):
+                logger.info(f"Confirmation dialog found, clicked it")
+                common.mouse_move(*get_layout().mouse_rest)
+                logger.info(f"clicked comfirm")
+                continue_clicked = True
+            elif common.click_matching("pictures/general/confirm_w.png", recursive=False):
+                pass
+                time.sleep(0.5)
+        elif state == ScreenState.IN_BATTLE:
             logger.info(f"tried to click continue but battle ongoing")
             common.error_screenshot()
             core.battle()
@@ -171,7 +175,7 @@ def squad_select_lux(mirror_instance, SelectTeam=False):
             if not common.click_matching(status, recursive=False):
                 found = common.match_image("pictures/CustomAdded1080p/general/squads/squad_select.png")
                 x,y = found[0]
-                offset_x, offset_y = common.scale_offset_1440p(90, 90)
+                offset_x, offset_y = get_layout().squad_scroll
                 common.mouse_move(x + offset_x, y + offset_y)
                 for i in range(30):
                     common.mouse_scroll(1000)
@@ -196,12 +200,11 @@ def squad_select_lux(mirror_instance, SelectTeam=False):
         
     common.click_matching("pictures/CustomAdded1080p/general/squads/to_battle.png")
     
-    while not common.element_exist("pictures/battle/winrate.png"):
-        common.sleep(0.5)
+    common.wait_for(any_of=["pictures/battle/winrate.png"])
         
     logger.info(f"Battle screen detected, entering battle")
     core.battle()
-    common.mouse_move(*common.scale_coordinates_1080p(200, 200))
+    common.mouse_move(*get_layout().mouse_rest)
     logger.info(f"Battle completed, checking for confirmation dialog")
     core.check_loading()
     click_continue()
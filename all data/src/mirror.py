@@ -8,6 +8,8 @@ import common
 import copy
 import shared_vars
 import mirror_utils
+from screen_state import ScreenState, MIRROR_CLASSIFIER
+from layout import get_layout
 from core import (skill_check, battle_check, battle, check_loading, 
                   transition_loading, post_run_load)
 
@@ -50,17 +52,13 @@ class Mirror:
     def floor_id():
         """Detect current floor number from pack selection screen"""
         floor = ""
+        floors = ["floor1", "floor2", "floor3", "floor4", "floor5"]
         # Must detect with grayscale because text color is different between mode
-        if common.element_exist('pictures/mirror/packs/floor1.png', 0.9, grayscale=True):
-            floor = "floor1"
-        elif common.element_exist('pictures/mirror/packs/floor2.png', 0.9, grayscale=True):
-            floor = "floor2"
-        elif common.element_exist('pictures/mirror/packs/floor3.png', 0.9, grayscale=True):
-            floor = "floor3"
-        elif common.element_exist('pictures/mirror/packs/floor4.png', 0.9, grayscale=True):
-            floor = "floor4"
-        elif common.element_exist('pictures/mirror/packs/floor5.png', 0.9, grayscale=True):
-            floor = "floor5"
+        found = common.match_many([f"pictures/mirror/packs/{i}.png" for i in floors], threshold=0.9, grayscale=True)
+        for i in floors:
+            if found[f"pictures/mirror/packs/{i}.png"]:
+                floor = i
+                break
         
         if floor:
             logger.info(f"Current floor detected: {floor}")
@@ -85,13 +83,11 @@ class Mirror:
             if common.element_exist("pictures/mirror/general/clear.png"):
                 common.click_matching("pictures/general/md_claim.png")
                 if common.click_matching("pictures/general/confirm_w.png", recursive=False):
-                    while True:  # handles the weekly reward / bp pass prompts
-                        if common.element_exist("pictures/mirror/general/weekly_reward.png"):
-                            common.key_press("enter")
-                        if common.element_exist("pictures/mirror/general/pass_level.png"):
-                            common.key_press("enter")
-                            #common.click_matching("pictures/general/confirm_b.png")
-                            break
+                    # handles the weekly reward / bp pass prompts
+                    while common.wait_for(any_of=["pictures/mirror/general/weekly_reward.png", "pictures/mirror/general/pass_level.png"]) == "pictures/mirror/general/weekly_reward.png":
+                        common.key_press("enter")
+                    common.key_press("enter")
+                    #common.click_matching("pictures/general/confirm_b.png")
                     common.click_matching("pictures/general/cancel.png")
             else:
                 common.click_matching("pictures/general/give_up.png")
@@ -101,8 +97,7 @@ class Mirror:
             check_loading()
 
         if common.click_matching("pictures/general/enter.png", recursive=False): #Fresh run
-            while(not common.element_exist("pictures/CustomAdded1080p/general/squads/squad_select.png")):
-                common.sleep(0.5) 
+            common.wait_for(any_of=["pictures/CustomAdded1080p/general/squads/squad_select.png"])
 
         if common.element_exist("pictures/CustomAdded1080p/general/squads/squad_select.png"): #checks if in Squad select
             self.initial_squad_selection()
@@ -131,7 +126,10 @@ class Mirror:
 
     def mirror_loop(self):
         """Handles all the mirror dungeon logic in this"""
-        if common.element_exist("pictures/general/maint.png"): #maintainance prompt
+        # One pass over every known screen instead of matching them one by one
+        state, _ = MIRROR_CLASSIFIER.classify()
+
+        if state == ScreenState.MAINTENANCE: #maintainance prompt
             common.click_matching("pictures/general/close.png", recursive=False)
             common.sleep(0.5)
             common.click_matching("pictures/general/no_op.png")
@@ -139,37 +137,37 @@ class Mirror:
             self.logger.critical("Server under maintenance")
             sys.exit(0)
 
-        if common.element_exist("pictures/events/skip.png"): #if hitting the events click skip to determine which is it
-            common.mouse_move(*common.scale_coordinates_1080p(200, 200))
+        if state == ScreenState.EVENT: #if hitting the events click skip to determine which is it
+            common.mouse_move(*get_layout().mouse_rest)
             common.click_skip(4)
             self.event_choice()
 
-        elif common.element_exist("pictures/mirror/general/danteh.png"): #checks if currently navigating
+        elif state == ScreenState.NAVIGATION: #checks if currently navigating
             self.navigation()
 
-        elif common.element_exist("pictures/CustomAdded1080p/general/squads/clear_selection.png"): #checks if in squad select and then proceeds with battle
+        elif state == ScreenState.SQUAD_SELECT: #checks if in squad select and then proceeds with battle
             self.squad_select()
 
-        elif common.element_exist("pictures/mirror/restshop/shop.png") or common.element_exist("pictures/mirror/restshop/super_shop.png") : #new combined shop and rest stop
+        elif state == ScreenState.REST_SHOP: #new combined shop and rest stop
             self.rest_shop()
 
-        elif common.element_exist("pictures/mirror/general/ego_gift_get.png"): #handles the ego gift get
+        elif state == ScreenState.EGO_GIFT_GET: #handles the ego gift get
             common.click_matching("pictures/general/confirm_b.png") #might replace with enter
 
-        elif common.element_exist("pictures/mirror/general/reward_select.png"): #checks if in reward select
+        elif state == ScreenState.REWARD_SELECT: #checks if in reward select
             self.reward_select()
 
-        elif common.element_exist("pictures/mirror/general/encounter_reward.png"): #checks if in encounter rewards
+        elif state == ScreenState.ENCOUNTER_REWARD: #checks if in encounter rewards
             self.encounter_reward_select()            
 
-        elif common.element_exist("pictures/CustomAdded1080p/mirror/packs/inpack.png"): #checks if in pack select
+        elif state == ScreenState.PACK_SELECT: #checks if in pack select
             self.pack_selection()
 
-        elif common.element_exist("pictures/battle/winrate.png"):
+        elif state == ScreenState.BATTLE:
             battle()
             check_loading()
 
-        elif common.element_exist("pictures/mirror/general/event_effect.png"):
+        elif state == ScreenState.EVENT_EFFECT:
             found = common.match_image("pictures/mirror/general/event_select.png")
             x,y = common.random_choice(found)
             common.mouse_move_click(x, y)
@@ -201,37 +199,36 @@ class Mirror:
         common.click_matching("pictures/CustomAdded1080p/mirror/general/Enter.png")
         common.sleep(1)
         common.click_matching("pictures/CustomAdded1080p/mirror/general/Confirm.png")
-        while(not common.element_exist("pictures/mirror/general/gift_select.png")): #Mitigate the weird freeze
-            common.sleep(0.5)
+        common.wait_for(any_of=["pictures/mirror/general/gift_select.png"]) #Mitigate the weird freeze
     
     def gift_selection(self):
         """selects the ego gift of the same status, fallsback on random if not unlocked"""
         gift = mirror_utils.gift_choice(self.status)
+        layout = get_layout()
         if not common.element_exist(gift,0.9): #Search for gift and if not present scroll to find it
             found = common.match_image("pictures/mirror/general/gift_select.png")
             x,y = found[0]
-            offset_x, offset_y = common.scale_offset_1440p(-1365, 50)
+            offset_x, offset_y = layout.gift_select_scroll
             common.mouse_move(x + offset_x, y + offset_y)
             for i in range(5):
                 common.mouse_scroll(-1000)
 
         found = common.match_image("pictures/mirror/general/gift_select.png")
         x,y = found[0]
-        _, offset_y = common.scale_offset_1440p(0, 235)
+        _, offset_y = layout.gift_list_first
         y = y + offset_y
-        _, offset1 = common.scale_offset_1440p(0, 190)
-        _, offset2 = common.scale_offset_1440p(0, 380)
+        _, offset1 = layout.gift_list_second
+        _, offset2 = layout.gift_list_third
         gift_pos = [y, y+offset1, y+offset2]
 
         initial_gift_coords = gift_pos if self.status != "sinking" else [*gift_pos[1:], gift_pos[0]]  # Deprioritize gift 0
 
         common.click_matching(gift,0.9) #click on specified
+        scaled_x = layout.x["gift_list"]
         for i in initial_gift_coords:
-            scaled_x, _ = common.scale_coordinates_1440p(1640, 0)
             common.mouse_move_click(scaled_x, i)
         common.key_press("enter")
-        while not common.element_exist("pictures/mirror/general/ego_gift_get.png"):
-            common.sleep(0.5)
+        common.wait_for(any_of=["pictures/mirror/general/ego_gift_get.png"])
         for i in range(3):
             if common.element_exist("pictures/mirror/general/ego_gift_get.png"): #handles the ego gift get
                 common.key_press("enter")
@@ -250,7 +247,7 @@ class Mirror:
         #This is to bring us to the first entry of teams
         found = common.match_image("pictures/CustomAdded1080p/general/squads/squad_select.png")
         x,y = found[0]
-        offset_x, offset_y = common.scale_offset_1440p(90, 90)
+        offset_x, offset_y = get_layout().squad_scroll
         common.mouse_move(x+offset_x,y+offset_y)
         if not common.click_matching(status, recursive=False):
             for i in range(30):
@@ -291,10 +288,8 @@ class Mirror:
                 floor = self.floor_id()
 
         # Filter for coordinate in specific area, to avoid noise
-        min_y_scaled = common.scale_y_1080p(260)
-        max_y_scaled = common.scale_y_1080p(800)
-        min_x_scaled = common.scale_x_1080p(150)
-        max_x_scaled = common.scale_x_1080p(1730)
+        layout = get_layout()
+        min_x_scaled, min_y_scaled, max_x_scaled, max_y_scaled = layout.pack_area
 
         # Use cached configs instead of file I/O
         floor_priorities = shared_vars.ConfigCache.get_config("pack_priority").get(floor, {})
@@ -304,7 +299,7 @@ class Mirror:
         retry_attempt = 10
         while retry_attempt > 0:
             retry_attempt -= 1
-            common.mouse_move(*common.scale_coordinates_1080p(200,200))
+            common.mouse_move(*get_layout().mouse_rest)
             common.sleep(2)
             if found := common.match_image("pictures/mirror/general/refresh.png", 0.9):
                 x,y = found[0]
@@ -316,55 +311,60 @@ class Mirror:
                 priority_sorted_packs = sorted(floor_priorities.items(), key=lambda x: x[1])
                 selectable_packs = [pack for pack, _ in priority_sorted_packs if pack not in exception_packs]
 
-                for pack in selectable_packs:
-                    floor_num = floor[-1]
-                    image_floor = f"f{floor_num}"
-                    pack_image = f"pictures/mirror/packs/{image_floor}/{pack}.png"
-                    selectable_priority_packs_pos.extend(common.match_image(pack_image, 0.9))
+                floor_num = floor[-1]
+                image_floor = f"f{floor_num}"
+                pack_images = [f"pictures/mirror/packs/{image_floor}/{pack}.png" for pack in selectable_packs]
+                for pack_pos in common.match_many(pack_images, threshold=0.9).values():
+                    selectable_priority_packs_pos.extend(pack_pos)
                 selectable_priority_packs_pos = [pos for pos in selectable_priority_packs_pos if min_y_scaled <= pos[1] <= max_y_scaled and min_x_scaled <= pos[0] <= max_x_scaled]
                 logger.debug(f"Found {len(selectable_priority_packs_pos)} packs which prioritized: {selectable_priority_packs_pos}")
 
                 # Correct position for mouse click
-                _, offset_y = common.scale_offset_1440p(0, -350)
+                _, offset_y = layout.pack_click
                 selectable_priority_packs_pos = [(pos[0], pos[1]+offset_y) for pos in selectable_priority_packs_pos]
             except Exception as e:
                 self.logger.warning(f"Error checking pack list matches: {e}. False back to select whatever available.")
 
-            # Detect except packs
+            # Detect except packs, selectable packs, status and owned markers in one parallel pass
+            floor_num = floor[-1]
+            image_floor = f"f{floor_num}"
+            except_pack_images = [f"pictures/mirror/packs/{image_floor}/{pack}.png" for pack in exception_packs]
+            inpack_image = "pictures/CustomAdded1080p/mirror/packs/inpack.png"
+            owned_image = "pictures/mirror/packs/status/owned.png"
+            pack_screen = common.match_many([*except_pack_images, inpack_image, status, owned_image],
+                                            thresholds={inpack_image: 0.8}, threshold=0.9)
+
             except_packs_pos = []
-            for pack in exception_packs:
-                floor_num = floor[-1]
-                image_floor = f"f{floor_num}"
-                pack_image = f"pictures/mirror/packs/{image_floor}/{pack}.png"
-                except_packs_pos.extend(common.match_image(pack_image, 0.9))
+            for pack_image in except_pack_images:
+                except_packs_pos.extend(pack_screen[pack_image])
             except_packs_pos = [pos for pos in except_packs_pos if min_y_scaled <= pos[1] <= max_y_scaled and min_x_scaled <= pos[0] <= max_x_scaled]
             logger.debug(f"Found {len(except_packs_pos)} packs in exception list: {except_packs_pos}")
 
             # Correct position for mouse click
-            _, offset_y = common.scale_offset_1440p(0, -350)
+            _, offset_y = layout.pack_click
             except_packs_pos = [(pos[0], pos[1]+offset_y) for pos in except_packs_pos]
 
             # Detect selectable pack
-            selectable_packs_pos = common.match_image("pictures/CustomAdded1080p/mirror/packs/inpack.png")
+            selectable_packs_pos = list(pack_screen[inpack_image])
             selectable_packs_pos = [pos for pos in selectable_packs_pos if min_y_scaled <= pos[1] <= max_y_scaled and min_x_scaled <= pos[0] <= max_x_scaled]
             logger.debug(f"Found {len(selectable_packs_pos)} packs in total: {selectable_packs_pos}")
-            for _pack in common.proximity_check(selectable_packs_pos, except_packs_pos, common.scale_x_1080p(150)):
+            for _pack in common.proximity_check(selectable_packs_pos, except_packs_pos, layout.x["pack_proximity"]):
                 selectable_packs_pos.remove(_pack)
                 logger.debug(f"Remove pack {_pack} since it is except pack")
 
             # Correct position for mouse click
-            offset_x, offset_y = common.scale_offset_1440p(-100, 150)
+            offset_x, offset_y = layout.selectable_pack_click
             selectable_packs_pos = [(pos[0]+offset_x, pos[1]+offset_y) for pos in selectable_packs_pos]
 
             # Detect status pack
-            status_gift_pos = common.match_image(status, 0.9)
+            status_gift_pos = list(pack_screen[status])
             if status == "pictures/mirror/packs/status/pierce_pack.png":
-                status_gift_pos = [x for x in status_gift_pos if x[1] > common.scale_y(1092)]  # Removes poor detections
+                status_gift_pos = [x for x in status_gift_pos if x[1] > layout.y["pierce_pack_min"]]  # Removes poor detections
 
-            owned_gift_pos = common.ifexist_match("pictures/mirror/packs/status/owned.png", 0.9)
+            owned_gift_pos = pack_screen[owned_image]
             if owned_gift_pos:
                 # Match owned tag to gift position
-                owned_gift_pos = common.proximity_check(status_gift_pos, owned_gift_pos, common.scale_x_1080p(50))
+                owned_gift_pos = common.proximity_check(status_gift_pos, owned_gift_pos, layout.x["owned_pack_proximity"])
                 if owned_gift_pos:
                     if len(status_gift_pos) <= len(owned_gift_pos):
                         logger.warning(f"Unexpected: status pack list (len {len(status_gift_pos)}) should be larger than number of pack list returned by proximity check (return {len(owned_gift_pos)})")
@@ -372,7 +372,7 @@ class Mirror:
                         status_gift_pos.remove(i)
                         logger.debug(f"Remove gift {i} since it's owned")
 
-            status_selectable_packs_pos = common.proximity_check(selectable_packs_pos, status_gift_pos, common.scale_x_1080p(432))
+            status_selectable_packs_pos = common.proximity_check(selectable_packs_pos, status_gift_pos, layout.x["status_pack_proximity"])
             status_selectable_packs_pos = [pos for pos in status_selectable_packs_pos if min_y_scaled <= pos[1] <= max_y_scaled and min_x_scaled <= pos[0] <= max_x_scaled]
             logger.debug(f"Found {len(status_selectable_packs_pos)} packs contain current status which haven't owned yet: {status_selectable_packs_pos}")
 
@@ -386,7 +386,7 @@ class Mirror:
                 elif refresh_btn_available:
                     # Refresh available --> click it to look for desired priority pack
                     common.click_matching("pictures/mirror/general/refresh.png", 0.9)
-                    common.mouse_move(*common.scale_coordinates_1080p(200, 200))
+                    common.mouse_move(*get_layout().mouse_rest)
                     continue
 
             # Only floor < 5 can have status packs
@@ -399,7 +399,7 @@ class Mirror:
                 elif refresh_btn_available:
                     # Refresh available --> click it to look for desired status pack
                     common.click_matching("pictures/mirror/general/refresh.png", 0.9)
-                    common.mouse_move(*common.scale_coordinates_1080p(200, 200))
+                    common.mouse_move(*get_layout().mouse_rest)
                     continue
 
             # Fallback: select whatever available
@@ -436,7 +436,7 @@ class Mirror:
                 common.mouse_move_click(x, y)
             self.squad_set = True
         # Click battle button
-        common.mouse_move_click(*common.scale_coordinates_1080p(1722, 881))
+        common.mouse_move_click(*get_layout().to_battle)
         # Fuck PM, battle button now blocked by event prompt... Wait at most 10 sec or win rate button, or skip button detected to go ahead
         for i in range(20):
             if common.element_exist("pictures/battle/winrate.png"):
@@ -455,16 +455,17 @@ class Mirror:
         if status_effect is None:
             status_effect = "pictures/mirror/rewards/poise_reward.png"
         ego_gift_matches = common.match_image("pictures/CustomAdded1080p/mirror/general/acquire_ego_gift_identifier.png")
+        layout = get_layout()
 
         # Filter owned ego gift
         owned_ego_gift_matches = common.match_image("pictures/mirror/rewards/owned.png")
         # Right shift to make "owned" pos closer to "acquire" (for proximity match)
         for i in range(len(owned_ego_gift_matches)):
-            owned_ego_gift_matches[i] = (owned_ego_gift_matches[i][0]+common.scale_x(200), owned_ego_gift_matches[i][1])
+            owned_ego_gift_matches[i] = (owned_ego_gift_matches[i][0]+layout.x["owned_reward_shift"], owned_ego_gift_matches[i][1])
         # Remove owned gifts from the pool of ego_gift_matches so they won't be selectable later
         selectable_ego_gift_matches = copy.deepcopy(ego_gift_matches)
         if owned_ego_gift_matches:
-            owned_ego_gift_matches = common.proximity_check(ego_gift_matches, owned_ego_gift_matches, common.scale_x_1080p(150))
+            owned_ego_gift_matches = common.proximity_check(ego_gift_matches, owned_ego_gift_matches, layout.x["owned_reward_proximity"])
             for pos in owned_ego_gift_matches:
                 selectable_ego_gift_matches.remove(pos)
 
@@ -472,14 +473,11 @@ class Mirror:
         if not found:
             logger.info("No gift matching status found.")
         # Filter rewards within specified boundaries
-        min_y_scaled = common.scale_y_1080p(225)
-        max_y_scaled = common.scale_y_1080p(845)
         # Should not filter by X-axis to allow more gift in the future
-        # min_x_scaled = common.scale_x_1080p(360)
-        # max_x_scaled = common.scale_x_1080p(1555)
+        _, min_y_scaled, _, max_y_scaled = layout.reward_area
         filtered_rewards = [reward for reward in found if min_y_scaled <= reward[1] <= max_y_scaled]
         if owned_ego_gift_matches:
-            owned_filtered_rewards = common.proximity_check(filtered_rewards, owned_ego_gift_matches, common.scale_x_1080p(200))
+            owned_filtered_rewards = common.proximity_check(filtered_rewards, owned_ego_gift_matches, layout.x["reward_proximity"])
             for pos in owned_filtered_rewards:
                 filtered_rewards.remove(pos)
 
@@ -493,7 +491,7 @@ class Mirror:
                 x,y = common.random_choice(filtered_rewards)
                 # Remove selected choice
                 filtered_rewards.remove((x, y))
-                selected_gift = common.proximity_check(selectable_ego_gift_matches, [(x, y)], common.scale_x_1080p(200))
+                selected_gift = common.proximity_check(selectable_ego_gift_matches, [(x, y)], layout.x["reward_proximity"])
                 for pos in selected_gift:
                     selectable_ego_gift_matches.remove(pos)
             if len(selectable_ego_gift_matches) > 0:
@@ -526,31 +524,30 @@ class Mirror:
                             "pictures/mirror/encounter_reward/resource.png"]
         common.sleep(0.5)
         # Define coordinate boundaries for reward selection
-        min_x = common.scale_x_1080p(360)
-        max_x = common.scale_x_1080p(1555)
-        min_y = common.scale_y_1080p(225)
-        max_y = common.scale_y_1080p(845)
-        for rewards in encounter_reward:
-            if common.click_matching(rewards, recursive=False, x1=min_x, y1=min_y, x2=max_x, y2=max_y):
-                common.click_matching("pictures/general/confirm_b.png")
-                common.sleep(1)
-                if common.element_exist("pictures/mirror/encounter_reward/prompt.png"):
-                    common.click_matching("pictures/CustomAdded1080p/mirror/general/BorderedConfirm.png")
-                    break
-                if common.element_exist("pictures/mirror/general/ego_gift_get.png"): #handles the ego gift get
-                    common.click_matching("pictures/general/confirm_b.png", recursive=False)
-                break
+        min_x, min_y, max_x, max_y = get_layout().reward_area
+        # All reward types are checked in one pass, the first one in priority order gets clicked
+        if common.click_first_match(encounter_reward, x1=min_x, y1=min_y, x2=max_x, y2=max_y):
+            common.click_matching("pictures/general/confirm_b.png")
+            common.sleep(1)
+            if common.element_exist("pictures/mirror/encounter_reward/prompt.png"):
+                common.click_matching("pictures/CustomAdded1080p/mirror/general/BorderedConfirm.png")
+            elif common.element_exist("pictures/mirror/general/ego_gift_get.png"): #handles the ego gift get
+                common.click_matching("pictures/general/confirm_b.png", recursive=False)
         common.sleep(3) #needs to wait for the gain to credits
 
     def check_nodes(self,nodes):
         """Check which navigation nodes exist on the current floor"""
         non_exist = [1,1,1]
-        top = common.greyscale_match_image("pictures/mirror/general/node_1.png",0.75)
-        top_alt = common.greyscale_match_image("pictures/mirror/general/node_1_o.png",0.75)
-        middle = common.greyscale_match_image("pictures/mirror/general/node_2.png",0.75)
-        middle_alt = common.greyscale_match_image("pictures/mirror/general/node_2_o.png",0.75)
-        bottom = common.greyscale_match_image("pictures/mirror/general/node_3_o.png",0.75)
-        bottom_alt = common.greyscale_match_image("pictures/mirror/general/node_3.png",0.75)
+        found = common.match_many(["pictures/mirror/general/node_1.png", "pictures/mirror/general/node_1_o.png",
+                                   "pictures/mirror/general/node_2.png", "pictures/mirror/general/node_2_o.png",
+                                   "pictures/mirror/general/node_3_o.png", "pictures/mirror/general/node_3.png"],
+                                  threshold=0.75, grayscale=True)
+        top = found["pictures/mirror/general/node_1.png"]
+        top_alt = found["pictures/mirror/general/node_1_o.png"]
+        middle = found["pictures/mirror/general/node_2.png"]
+        middle_alt = found["pictures/mirror/general/node_2_o.png"]
+        bottom = found["pictures/mirror/general/node_3_o.png"]
+        bottom_alt = found["pictures/mirror/general/node_3.png"]
         if not top and not top_alt:
             non_exist[0] = 0
         if not middle and not middle_alt:
@@ -576,8 +573,7 @@ class Mirror:
             if time.time() > end_time:
                 break
 
-        while common.element_exist("pictures/general/connection_o.png"):
-            pass
+        common.wait_for(none_of=["pictures/general/connection_o.png"])
 
         if common.click_matching("pictures/mirror/general/nav_enter.png", recursive=False):
             return
@@ -595,21 +591,22 @@ class Mirror:
 
             for y in node_y:
                 if self.aspect_ratio == "4:3":
-                    node_location.append(common.scale_coordinates_1440p(1440, y + 105))
+                    node_location.append(get_layout().column_point("map_node", y + 105))
                 else:
-                    node_location.append(common.scale_coordinates_1440p(1440, y))
+                    node_location.append(get_layout().column_point("map_node", y))
 #           
             if drag_danteh and self.aspect_ratio == "16:9": #Drag because 16:9 blocks the top view of the cost
-                common.mouse_move(*common.scale_coordinates_1080p(200, 200))
+                common.mouse_move(*get_layout().mouse_rest)
                 if found := common.match_image("pictures/mirror/general/danteh.png"):
                     x,y = found[0]
                     common.mouse_move(x,y)
-                    _, offset_y = common.scale_offset_1440p(0, 100)
+                    _, offset_y = get_layout().danteh_drag
                     common.mouse_drag(x, y + offset_y)
 
             combat_nodes = common.match_image("pictures/mirror/general/cost.png")
-            combat_nodes = [x for x in combat_nodes if x[0] > common.scale_x(1280) and x[0] < common.scale_x(1601)]
-            combat_nodes_locs = common.proximity_check_fuse(node_location, combat_nodes,common.scale_x(100), common.scale_y(200))
+            layout = get_layout()
+            combat_nodes = [x for x in combat_nodes if x[0] > layout.x["combat_node_min"] and x[0] < layout.x["combat_node_max"]]
+            combat_nodes_locs = common.proximity_check_fuse(node_location, combat_nodes, layout.x["combat_node_fuse"], layout.y["combat_node_fuse"])
             node_location = [i for i in node_location if i not in list(combat_nodes_locs)]
             node_location = node_location + list(combat_nodes_locs)
 
@@ -653,11 +650,10 @@ class Mirror:
         """Execute fusion of selected gifts"""
         common.click_matching("pictures/mirror/restshop/fusion/fuse_b.png")
         if common.element_exist("pictures/CustomAdded1080p/mirror/general/cannot_fuse.png"):
-            common.mouse_move(*common.scale_coordinates_1080p(50, 50))
+            common.mouse_move(*get_layout().mouse_corner)
             return False
         common.click_matching("pictures/general/confirm_b.png")
-        while(not common.element_exist("pictures/mirror/general/ego_gift_get.png")): #in the event of slow connection
-            common.sleep(0.5)
+        common.wait_for(any_of=["pictures/mirror/general/ego_gift_get.png"]) #in the event of slow connection
         common.key_press("enter")
         return True
 
@@ -666,10 +662,22 @@ class Mirror:
         fusion_gifts = []
         
         # Region limitation for performance: (900,300) to (1700,800) in 1080p
-        x1, y1 = common.scale_coordinates_1080p(900, 300)
-        x2, y2 = common.scale_coordinates_1080p(1700, 800)
+        x1, y1, x2, y2 = get_layout().rest_shop_gifts
         
-        vestige_coords = common.ifexist_match("pictures/mirror/restshop/market/vestige_2.png", x1=x1, y1=y1, x2=x2, y2=y2)
+        vestige = "pictures/mirror/restshop/market/vestige_2.png"
+        thresholds = {vestige: 0.8}
+        for i in statuses:
+            # Use higher threshold for pierce since somehow the ++ icons on upgraded gifts were detected as pierce?!?!?
+            # Similarly, it can mistake circular part of left side fusion UI as slash icon
+            if i == 'pierce' or i == 'slash':
+                thresholds[mirror_utils.get_status_gift_template(i)] = 0.79
+            else:
+                thresholds[mirror_utils.get_status_gift_template(i)] = 0.75
+        
+        # Vestige and every status icon are matched in one parallel pass
+        found = common.match_many(list(thresholds), roi=(x1, y1, x2, y2), thresholds=thresholds)
+        
+        vestige_coords = found[vestige]
         if vestige_coords:
             fusion_gifts += vestige_coords
             # Store vestige coords for later identification
@@ -677,21 +685,8 @@ class Mirror:
         else:
             self.vestige_coords = None
             
-        for i in statuses:
-            status = mirror_utils.get_status_gift_template(i)
-            
-            # Use higher threshold for pierce since somehow the ++ icons on upgraded gifts were detected as pierce?!?!?
-            # Similarly, it can mistake circular part of left side fusion UI as slash icon
-            if i == 'pierce' or i == 'slash':
-                threshold = 0.79
-            else:
-                threshold = 0.75
-            
-            status_coords = common.ifexist_match(status, threshold, x1=x1, y1=y1, x2=x2, y2=y2)
-            if status_coords:
-                fusion_gifts += status_coords
-            else:
-                pass
+        for status in list(thresholds)[1:]:
+            fusion_gifts += found[status]
         
         # Remove duplicate coordinates
         original_count = len(fusion_gifts)
@@ -702,7 +697,8 @@ class Mirror:
         # Filter out status detections that are inside exception gift areas
         fusion_gifts = self.filter_exception_gifts(fusion_gifts)
         
-        return [x for x in fusion_gifts if x[0] > common.scale_x(1235) and x[1] < common.scale_y(800)] #this is to remove the left side and bottom area 
+        layout = get_layout()
+        return [x for x in fusion_gifts if x[0] > layout.x["fusion_gift_min"] and x[1] < layout.y["fusion_gift_max"]] #this is to remove the left side and bottom area 
     
     def filter_exception_gifts(self, fusion_gifts):
         """Remove status detections that are inside exception gift areas"""
@@ -715,14 +711,12 @@ class Mirror:
         
         # Find all exception gift bounding boxes once
         # Region limitation for performance: (900,300) to (1700,800) in 1080p
-        x1, y1 = common.scale_coordinates_1080p(900, 300)
-        x2, y2 = common.scale_coordinates_1080p(1700, 800)
+        x1, y1, x2, y2 = get_layout().rest_shop_gifts
         
         all_exception_boxes = []
-        for gift_img in exception_gifts:
-            boxes = common.ifexist_match(gift_img, 0.9, area="all", x1=x1, y1=y1, x2=x2, y2=y2)
-            if boxes:
-                all_exception_boxes.extend(boxes)
+        found = common.match_many(exception_gifts, roi=(x1, y1, x2, y2), threshold=0.9, area="all")
+        for boxes in found.values():
+            all_exception_boxes.extend(boxes)
         
         if not all_exception_boxes:
             return fusion_gifts
@@ -787,10 +781,10 @@ class Mirror:
             else:
                 time.sleep(0.1)
         status_picture = mirror_utils.get_fusion_target_button(self.status)
-        common.mouse_move_click(*common.scale_coordinates_1440p(730, 700))
+        common.mouse_move_click(*get_layout().fusion_keyword)
         time.sleep(0.5)
         while not common.click_matching(status_picture, recursive=False):
-            common.mouse_move_click(*common.scale_coordinates_1440p(730, 700))
+            common.mouse_move_click(*get_layout().fusion_keyword)
             time.sleep(2)
         common.click_matching("pictures/general/confirm_b.png")
         common.click_matching("pictures/mirror/restshop/fusion/bytier.png")
@@ -828,7 +822,7 @@ class Mirror:
                     common.mouse_scroll(-1000)
                 common.sleep(0.5)
                 fusion_gifts_scroll = self.find_gifts(statuses)
-                duplicates = common.proximity_check_fuse(fusion_gifts_scroll,fusion_gifts,common.scale_x(10),common.scale_y(348))
+                duplicates = common.proximity_check_fuse(fusion_gifts_scroll,fusion_gifts,get_layout().x["fusion_duplicate"],get_layout().y["fusion_duplicate"])
                 for i in duplicates:
                     fusion_gifts_scroll.remove(i)
                 if (len(fusion_gifts_scroll) + click_count) >= 3:
@@ -853,14 +847,14 @@ class Mirror:
         """Handle rest shop activities: fusion, healing, enhancement, and buying"""
         def leave_restshop():
             """Leave the restshop with proper confirmation handling"""
-            common.mouse_move_click(*common.scale_coordinates_1080p(50,50))
+            common.mouse_move_click(*get_layout().mouse_corner)
             while not common.click_matching("pictures/mirror/restshop/leave.png", recursive=False):
                 common.key_press("esc")
                 for _ in range(5):
-                    common.mouse_move_click(*common.scale_coordinates_1080p(50,50))
+                    common.mouse_move_click(*get_layout().mouse_corner)
 
             if not common.element_exist("pictures/general/confirm_w.png"):
-                common.mouse_move_click(*common.scale_coordinates_1080p(50,50))
+                common.mouse_move_click(*get_layout().mouse_corner)
                 common.click_matching("pictures/mirror/restshop/leave.png")
             common.click_matching("pictures/general/confirm_w.png")
             common.click_matching("pictures/general/confirm_b.png", recursive=False)
@@ -902,7 +896,7 @@ class Mirror:
                         common.mouse_scroll(1000)
                 self.enhance_gifts(status)
                 while not common.click_matching("pictures/mirror/restshop/close.png", recursive=False):
-                    common.mouse_move(*common.scale_coordinates_1080p(50, 50))
+                    common.mouse_move(*get_layout().mouse_corner)
                     time.sleep(0.5)
 
             # BUYING
@@ -910,6 +904,7 @@ class Mirror:
                 status = mirror_utils.market_choice(self.status)
                 if status is None:
                     status = "pictures/mirror/restshop/market/poise_market.png"
+                layout = get_layout()
                 for _ in range(2):  # Refresh at most 2 times, TODO: implement refresh based on available cost
                     if common.click_matching("pictures/mirror/restshop/shop_scroll_up.png", recursive=False):  # Try to scroll up first, this usually happens when the shop is refreshed
                         for _ in range(45): # Scroll up to the top
@@ -922,13 +917,13 @@ class Mirror:
                         wordless_matches = common.ifexist_match("pictures/mirror/restshop/market/wordless.png")
                         if wordless_matches:
                             # Filters in the event of the skill replacement being detected
-                            wordless_gifts = [x for x in wordless_matches if not (abs(x[0] - common.scale_x(1300)) <= 10 and abs(x[1] - common.scale_y(541)) <= 10)] 
+                            wordless_gifts = [x for x in wordless_matches if not (abs(x[0] - layout.x["market_skill_replacement"]) <= 10 and abs(x[1] - layout.y["market_skill_replacement"]) <= 10)] 
                             market_gifts += wordless_gifts
                         if len(market_gifts):
-                            market_gifts = [x for x in market_gifts if (x[0] > common.scale_x(1091) and x[0] < common.scale_x(2322)) and (x[1] > common.scale_y(434) and x[1] < common.scale_y(919))] # filter within purchase area
+                            market_gifts = [x for x in market_gifts if (x[0] > layout.x["market_min"] and x[0] < layout.x["market_max"]) and (x[1] > layout.y["market_min"] and x[1] < layout.y["market_max"])] # filter within purchase area
+                            offset_x, offset_y = layout.market_purchased_probe
                             for x,y in market_gifts:
                                 # x,y = i
-                                offset_x, offset_y = common.scale_offset_1440p(25, 1)
                                 if common.luminence(x + offset_x, y + offset_y) < 2: # this area will have a value of less than or equal to 5 if purchased
                                     continue
                                 if common.element_exist("pictures/mirror/restshop/small_not.png"):
@@ -950,7 +945,7 @@ class Mirror:
                     if common.element_exist("pictures/mirror/restshop/small_not.png"):
                         break
 
-                    common.mouse_move_click(*common.scale_coordinates_1080p(50, 50))
+                    common.mouse_move_click(*get_layout().mouse_corner)
                     common.sleep(1)
                     common.click_matching("pictures/mirror/restshop/market/refresh.png")
                     common.sleep(1)
@@ -972,22 +967,21 @@ class Mirror:
     def enhance_gifts(self,status):
         """Enhancement gift process"""
         # Region limitation for performance: (900,300) to (1700,800) in 1080p
-        x1, y1 = common.scale_coordinates_1080p(900, 300)
-        x2, y2 = common.scale_coordinates_1080p(1700, 800)
+        x1, y1, x2, y2 = get_layout().rest_shop_gifts
         
         while(True):
             gifts = common.ifexist_match(status, x1=x1, y1=y1, x2=x2, y2=y2)
             if gifts:
                 shift_x, shift_y = mirror_utils.enhance_shift(self.status) or (12, -41)
-                gifts = [i for i in gifts if i[0] > common.scale_x(1200)] #remove false positives on the left side
-                shift_x_scaled, shift_y_scaled = common.scale_offset_1440p(shift_x, shift_y)
-                gifts = [i for i in gifts if common.luminence(i[0]+shift_x_scaled,i[1]+shift_y_scaled) > 21]
+                gifts = [i for i in gifts if i[0] > get_layout().x["enhance_gift_min"]] #remove false positives on the left side
+                shift_x_scaled, shift_y_scaled = get_layout().offset(shift_x, shift_y)
+                gifts = [i for i, lum in zip(gifts, common.sample_pixels([(x + shift_x_scaled, y + shift_y_scaled) for x, y in gifts])) if lum > 21]
                 # Find all fully_upgraded coordinates once, then filter gifts using those coordinates
                 fully_upgraded_coords = common.ifexist_match("pictures/CustomAdded1080p/mirror/general/fully_upgraded.png", 0.7, x1=x1, y1=y1, x2=x2, y2=y2)
                 if fully_upgraded_coords:
                     # Scale 100px expansion values from 1080p base to current resolution
-                    expand_left_scaled = common.scale_x_1080p(100)
-                    expand_below_scaled = common.scale_y_1080p(100)
+                    expand_left_scaled = get_layout().x["upgraded_gift_expand"]
+                    expand_below_scaled = get_layout().y["upgraded_gift_expand"]
                     # Use enhanced_proximity_check with fully_upgraded as center, filter out gifts within expanded areas
                     gifts = [gift for gift in gifts if not common.enhanced_proximity_check(fully_upgraded_coords,
                                                                                          [gift], 
@@ -1001,8 +995,8 @@ class Mirror:
             wordless_gifts = common.ifexist_match("pictures/mirror/restshop/enhance/wordless_enhance.png", x1=x1, y1=y1, x2=x2, y2=y2)
             if wordless_gifts:
                 shift_x, shift_y = mirror_utils.enhance_shift("wordless")
-                shift_x_scaled, shift_y_scaled = common.scale_offset_1440p(shift_x, shift_y)
-                wordless_gifts = [i for i in wordless_gifts if common.luminence(i[0]+shift_x_scaled,i[1]+shift_y_scaled) > 22]
+                shift_x_scaled, shift_y_scaled = get_layout().offset(shift_x, shift_y)
+                wordless_gifts = [i for i, lum in zip(wordless_gifts, common.sample_pixels([(x + shift_x_scaled, y + shift_y_scaled) for x, y in wordless_gifts])) if lum > 22]
                 if len(wordless_gifts):
                     if not self.upgrade(wordless_gifts,"pictures/mirror/restshop/enhance/wordless_enhance.png",shift_x,shift_y):
                         break  # Exit loop if insufficient resources
@@ -1024,7 +1018,7 @@ class Mirror:
             skill_check()
 
         elif common.click_matching("pictures/events/select_gain.png", recursive=False): #Select to gain EGO Gift
-            common.mouse_move_click(*common.scale_coordinates_1440p(1193, 623))
+            common.mouse_move_click(*get_layout().event_choice)
             while(True):
                 common.mouse_click()
                 if common.click_matching("pictures/events/proceed.png", recursive=False):
@@ -1055,7 +1049,7 @@ class Mirror:
                 pass
             elif common.click_matching("pictures/events/midwinter.png", recursive=False):
                 pass
-            common.mouse_move_click(*common.scale_coordinates_1440p(1193, 623))
+            common.mouse_move_click(*get_layout().event_choice)
             while(True):
                 common.mouse_click()
                 if common.click_matching("pictures/events/proceed.png", recursive=False):
@@ -1095,18 +1089,16 @@ class Mirror:
         """Handle victory screen and claim rewards"""
         common.click_matching("pictures/general/confirm_w.png", recursive=False)
         common.click_matching("pictures/general/beeg_confirm.png")
-        common.mouse_move(*common.scale_coordinates_1080p(200,200))
+        common.mouse_move(*get_layout().mouse_rest)
         common.click_matching("pictures/general/claim_rewards.png")
         common.sleep(1)
         common.click_matching("pictures/general/md_claim.png")
         common.sleep(0.5)
         if common.click_matching("pictures/general/confirm_w.png", recursive=False):
-            while(True):
-                if common.element_exist("pictures/mirror/general/weekly_reward.png"): #Weekly Prompt
-                    common.key_press("enter")
-                if common.element_exist("pictures/mirror/general/pass_level.png"): #BP Promptw
-                    common.key_press("enter")
-                    break
+            # Weekly prompt may come before the BP prompt
+            while common.wait_for(any_of=["pictures/mirror/general/weekly_reward.png", "pictures/mirror/general/pass_level.png"]) == "pictures/mirror/general/weekly_reward.png":
+                common.key_press("enter")
+            common.key_press("enter")
             post_run_load()
         else: #incase not enough modules
             common.click_matching("pictures/general/to_window.png")
@@ -1119,7 +1111,7 @@ class Mirror:
         """Handle defeat screen and cleanup"""
         common.click_matching("pictures/general/confirm_w.png", recursive=False)
         common.click_matching("pictures/general/beeg_confirm.png")
-        common.mouse_move(*common.scale_coordinates_1080p(200,200))
+        common.mouse_move(*get_layout().mouse_rest)
         common.click_matching("pictures/general/claim_rewards.png")
         common.sleep(1)
         common.click_matching("pictures/general/give_up.png")
@@ -0,0 +1,132 @@
+"""
+Screen State - identifies the current game screen from a single frame
+
+Every detector of a classifier is checked against the same captured frame, each
+within its own or its learned region, and the first matching state in priority
+order wins. The results of all detectors are returned too, so callers can act on
+more than one cue without matching again.
+"""
+import time
+import logging
+from enum import Enum
+import common
+
+logger = logging.getLogger(__name__)
+
+class ScreenState(Enum):
+    """Screens the bot knows how to handle"""
+    UNKNOWN = "unknown"
+    MAINTENANCE = "maintenance"
+    SERVER_ERROR = "server_error"
+    LOADING = "loading"
+    EVENT = "event"
+    NAVIGATION = "navigation"
+    SQUAD_SELECT = "squad_select"
+    REST_SHOP = "rest_shop"
+    EGO_GIFT_GET = "ego_gift_get"
+    REWARD_SELECT = "reward_select"
+    ENCOUNTER_REWARD = "encounter_reward"
+    PACK_SELECT = "pack_select"
+    BATTLE = "battle"
+    BATTLE_SETTINGS = "battle_settings"
+    IN_BATTLE = "in_battle"
+    EVENT_EFFECT = "event_effect"
+    CONFIRM = "confirm"
+
+class Detector:
+    """Template based check for one screen state"""
+
+    def __init__(self, state, templates, threshold=0.8, roi=None, no_grayscale=False):
+        """
+        Args:
+            state: ScreenState reported when any of the templates is found
+            templates: Template path or list of paths
+            roi: Optional (x1, y1, x2, y2) search region in screen coordinates, without one
+                 each template uses its template_regions.json entry or learned region,
+                 falling back to the full frame
+        """
+        self.state = state
+        self.templates = [templates] if isinstance(templates, str) else list(templates)
+        self.threshold = threshold
+        self.roi = roi
+        self.no_grayscale = no_grayscale
+
+    def check(self, frame):
+        """Check the detector against a captured frame"""
+        x1, y1, x2, y2 = self.roi if self.roi else (None, None, None, None)
+        return any(common.exists(template, self.threshold, no_grayscale=self.no_grayscale, quiet_failure=True,
+                                 x1=x1, y1=y1, x2=x2, y2=y2, frame=frame)
+                   for template in self.templates)
+
+class ScreenClassifier:
+    """Evaluates a prioritised list of detectors on one frame"""
+
+    def __init__(self, name, detectors):
+        self.name = name
+        self.detectors = detectors
+        self.last_latency = 0.0
+        self.total_latency = 0.0
+        self.ticks = 0
+
+    def classify(self):
+        """Classify the current screen.
+
+        The frame comes from the vision worker when one runs, but the detectors are
+        matched in this process so they all see that same frame.
+
+        Returns:
+            (state, results) where state is the highest priority ScreenState found, or UNKNOWN,
+            and results maps every detector's ScreenState to whether it was found
+        """
+        start = time.perf_counter()
+        frame = common.get_frame()
+        found = common.map_on_match_pool(lambda detector: detector.check(frame), self.detectors)
+
+        results = {}
+        for detector, detected in zip(self.detectors, found):
+            # Several detectors may share a state, it counts as found if any of them is
+            results[detector.state] = results.get(detector.state, False) or detected
+        state = next((detector.state for detector in self.detectors if results[detector.state]), ScreenState.UNKNOWN)
+
+        self.last_latency = time.perf_counter() - start
+        self.total_latency += self.last_latency
+        self.ticks += 1
+        logger.debug(f"{self.name} screen state: {state.value} in {self.last_latency * 1000:.1f} ms "
+                     f"(avg {self.average_latency() * 1000:.1f} ms over {self.ticks} ticks)", dirty=True)
+        return state, results
+
+    def average_latency(self):
+        """Average classification time in seconds"""
+        return self.total_latency / self.ticks if self.ticks else 0.0
+
+# Same priority order as the checks Mirror.mirror_loop used to run one by one
+MIRROR_CLASSIFIER = ScreenClassifier("Mirror", [
+    Detector(ScreenState.MAINTENANCE, "pictures/general/maint.png"),
+    Detector(ScreenState.EVENT, "pictures/events/skip.png"),
+    Detector(ScreenState.NAVIGATION, "pictures/mirror/general/danteh.png"),
+    Detector(ScreenState.SQUAD_SELECT, "pictures/CustomAdded1080p/general/squads/clear_selection.png"),
+    Detector(ScreenState.REST_SHOP, ["pictures/mirror/restshop/shop.png", "pictures/mirror/restshop/super_shop.png"]),
+    Detector(ScreenState.EGO_GIFT_GET, "pictures/mirror/general/ego_gift_get.png"),
+    Detector(ScreenState.REWARD_SELECT, "pictures/mirror/general/reward_select.png"),
+    Detector(ScreenState.ENCOUNTER_REWARD, "pictures/mirror/general/encounter_reward.png"),
+    Detector(ScreenState.PACK_SELECT, "pictures/CustomAdded1080p/mirror/packs/inpack.png"),
+    Detector(ScreenState.BATTLE, "pictures/battle/winrate.png"),
+    Detector(ScreenState.EVENT_EFFECT, "pictures/mirror/general/event_effect.png"),
+])
+
+# Cues core.battle reacts to on every tick
+BATTLE_CLASSIFIER = ScreenClassifier("Battle", [
+    Detector(ScreenState.SERVER_ERROR, "pictures/general/server_error.png"),
+    Detector(ScreenState.LOADING, "pictures/general/loading.png"),
+    Detector(ScreenState.BATTLE_SETTINGS, "pictures/CustomAdded1080p/battle/setting_cog.png"),
+    Detector(ScreenState.EVENT, "pictures/events/skip.png"),
+    Detector(ScreenState.BATTLE, "pictures/battle/winrate.png"),
+    Detector(ScreenState.ENCOUNTER_REWARD, "pictures/mirror/general/encounter_reward.png"),
+])
+
+# Dialogs left after a luxcavation battle
+LUX_CONTINUE_CLASSIFIER = ScreenClassifier("Luxcavation", [
+    Detector(ScreenState.CONFIRM, ["pictures/CustomAdded1080p/luxcavation/thread/confirminverted.png",
+                                   "pictures/general/confirm_w.png"]),
+    Detector(ScreenState.IN_BATTLE, "pictures/CustomAdded1080p/battle/in_battle_area.png"),
+])
@@ -25,7 +25,6 @@ logger = logging.getLogger(__name__)
 # Config cache system
 _config_cache = {}
 _cache_lock = Lock()
-_scaled_coords_cache = {}
 
 class ConfigCache:
     
@@ -88,102 +87,25 @@ class ConfigCache:
         
         # Load image threshold configuration
         ConfigCache._load_config("image_thresholds")
+        
+        # Load default search regions of templates
+        ConfigCache._load_config("template_regions")
 
 class ScaledCoordinates:
+    """Named coordinate sets, kept for callers from before layout.Layout"""
     
     @staticmethod
     def get_scaled_coords(coord_set_name):
-        """Get scaled coordinate set, calculating if needed"""
-        if coord_set_name not in _scaled_coords_cache:
-            ScaledCoordinates._calculate_coords(coord_set_name)
-        return _scaled_coords_cache.get(coord_set_name, {})
-    
-    @staticmethod
-    def _calculate_coords(coord_set_name):
-        """Calculate and cache scaled coordinates for different screen resolutions"""
-        import common
-        
-        if coord_set_name == "grace_of_stars":
-            base_coords = {
-                "star of the beniggening": (300, 350),
-                "cumulating starcloud": (600, 350),
-                "interstellar travel": (900, 350),
-                "star shower": (1200, 350),
-                "binary star shop": (1500, 350),
-                "moon star shop": (300, 650),
-                "favor of the nebula": (600, 650),
-                "starlight guidance": (900, 650),
-                "chance comet": (1200, 650),
-                "perfected possibility": (1500, 650)
-            }
-            scaled_coords = {}
-            for name, (x, y) in base_coords.items():
-                scaled_coords[name] = common.scale_coordinates_1080p(x, y)
-            _scaled_coords_cache[coord_set_name] = scaled_coords
-            logger.debug(f"Calculated scaled coordinates for {coord_set_name}")
-        
-        elif coord_set_name == "character_positions":
-            base_coords = {
-                "yisang": (580, 500),
-                "faust": (847, 500),
-                "donquixote": (1113, 500),
-                "ryoshu": (1380, 500),
-                "meursault": (1647, 500),
-                "honglu": (1913, 500),
-                "heathcliff": (580, 900),
-                "ishmael": (847, 900),
-                "rodion": (1113, 900),
-                "sinclair": (1380, 900),
-                "outis": (1647, 900),
-                "gregor": (1913, 900)
-            }
-            scaled_coords = {}
-            for name, (x, y) in base_coords.items():
-                # Use 1440p scaling for character positions as per original code
-                scaled_coords[name] = common._uniform_scale_coordinates(x, y, common.REFERENCE_WIDTH_1440P, common.REFERENCE_HEIGHT_1440P, use_uniform=False)
-            _scaled_coords_cache[coord_set_name] = scaled_coords
-            logger.debug(f"Calculated scaled character positions for {coord_set_name}")
-        
-        elif coord_set_name == "battle_buttons":
-            base_coords = {
-                "to_battle": (1722, 881),  # Squad selection to battle button
-            }
-            scaled_coords = {}
-            for name, (x, y) in base_coords.items():
-                scaled_coords[name] = common.scale_coordinates_1080p(x, y)
-            _scaled_coords_cache[coord_set_name] = scaled_coords
-            logger.debug(f"Calculated scaled battle button coordinates for {coord_set_name}")
-        
-        elif coord_set_name == "luxcavation_coords":
-            base_coords = {
-                "latest_stage": (1613, 715),  # EXP latest stage click
-                "exp_drag_start": (397, 48),  # EXP drag movements
-                "exp_drag_end": (1920, 48),
-                "exp_drag_middle": (1152, 48),
-                "thread_select": (564, 722),  # Thread selection
-                "latest_difficulty": (925, 725),  # Latest difficulty
-                "squad_scroll_offset": (90, 90),  # Squad scroll offset
-            }
-            scaled_coords = {}
-            for name, (x, y) in base_coords.items():
-                if name == "squad_scroll_offset":
-                    # Use uniform scaling for squad offset
-                    scaled_coords[name] = common.scale_coordinates_1440p(x, y)
-                else:
-                    # Use 1080p scaling for other coordinates
-                    scaled_x = common.scale_x_1080p(x)
-                    scaled_y = common.scale_y_1080p(y)
-                    scaled_coords[name] = (scaled_x, scaled_y)
-            _scaled_coords_cache[coord_set_name] = scaled_coords
-            logger.debug(f"Calculated scaled luxcavation coordinates for {coord_set_name}")
+        """Get scaled coordinate set of the current layout"""
+        import layout
+        return layout.get_layout().coord_set(coord_set_name)
     
     @staticmethod
     def preload_all_coordinates():
         """Preload all coordinate sets for performance"""
-        coord_sets = ["grace_of_stars", "character_positions", "battle_buttons", "luxcavation_coords"]
-        for coord_set in coord_sets:
-            ScaledCoordinates.get_scaled_coords(coord_set)
-        logger.info(f"Preloaded {len(coord_sets)} coordinate sets")
+        import layout
+        layout.get_layout()
+        logger.info("Preloaded scaled layout")
 
 def _get_gui_values():
     """Extract current variable values from GUI module"""
@@ -291,3 +213,6 @@ except (ImportError, AttributeError):
 
 # Load image threshold configuration
 image_threshold_config = ConfigCache.get_config("image_thresholds")
+
+# Load default search regions of templates
+template_region_config = ConfigCache.get_config("template_regions")
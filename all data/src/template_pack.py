@@ -0,0 +1,189 @@
+"""
+Template Pack - precompiled templates for one screen resolution
+
+Every PNG under pictures/ is decoded, resized to the target resolution and written,
+in both greyscale and BGR, into one flat binary file next to a JSON index. The pack
+is loaded with numpy.memmap so the GUI's child processes share the same pages
+instead of each decoding 300+ PNGs on first use.
+
+The pack file name carries a content hash of the picture files, so a changed picture
+set or resolution simply produces a new pack and the old one is cleaned up.
+
+Usage: python template_pack.py [width height]
+"""
+import os
+import sys
+import json
+import hashlib
+import logging
+import numpy as np
+
+# Determine if running as executable or script
+def get_base_path():
+    """Get the base directory path"""
+    if getattr(sys, 'frozen', False):
+        # Running as compiled exe
+        return os.path.dirname(sys.executable)
+    else:
+        # Running as script
+        folder_path = os.path.dirname(os.path.abspath(__file__))
+        # Check if we're in the src folder or main folder
+        if os.path.basename(folder_path) == 'src':
+            return os.path.dirname(folder_path)
+        return folder_path
+
+# Get base path for resource access
+BASE_PATH = get_base_path()
+PICTURES_DIR = os.path.join(BASE_PATH, "pictures")
+PACK_DIR = os.path.join(BASE_PATH, "template_cache")
+PACK_VERSION = 1
+PACK_ALIGNMENT = 64  # Byte alignment of every template inside the pack
+
+logger = logging.getLogger(__name__)
+
+def list_template_paths():
+    """List every template as a relative 'pictures/...' path with forward slashes"""
+    template_paths = []
+    for root, _, files in os.walk(PICTURES_DIR):
+        for name in files:
+            if name.lower().endswith(".png"):
+                rel_path = os.path.relpath(os.path.join(root, name), BASE_PATH)
+                template_paths.append(rel_path.replace(os.sep, "/"))
+    return sorted(template_paths)
+
+def compute_content_hash(template_paths, width, height):
+    """Hash the picture files together with the target resolution and pack format"""
+    digest = hashlib.sha1(f"{PACK_VERSION}:{width}x{height}".encode())
+    for template_path in template_paths:
+        digest.update(template_path.encode())
+        with open(os.path.join(BASE_PATH, template_path), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def _pack_paths(width, height, content_hash):
+    """Get (binary path, index path) of the pack for a resolution and content hash"""
+    name = f"templates_{width}x{height}_{content_hash[:16]}"
+    return os.path.join(PACK_DIR, name + ".bin"), os.path.join(PACK_DIR, name + ".json")
+
+def _remove_stale_packs(width, height, keep_paths):
+    """Delete packs of the same resolution built from older picture sets"""
+    prefix = f"templates_{width}x{height}_"
+    for name in os.listdir(PACK_DIR):
+        path = os.path.join(PACK_DIR, name)
+        if name.startswith(prefix) and path not in keep_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                # Still mapped by another process, next rebuild will retry
+                pass
+
+def build_pack(width, height, template_paths=None, content_hash=None):
+    """Compile all templates for the given resolution into a pack, returns the index path"""
+    import common
+
+    if template_paths is None:
+        template_paths = list_template_paths()
+    if content_hash is None:
+        content_hash = compute_content_hash(template_paths, width, height)
+    bin_path, index_path = _pack_paths(width, height, content_hash)
+    os.makedirs(PACK_DIR, exist_ok=True)
+
+    index = {
+        "version": PACK_VERSION,
+        "width": width,
+        "height": height,
+        "hash": content_hash,
+        "templates": {}
+    }
+    offset = 0
+    tmp_bin_path = f"{bin_path}.{os.getpid()}.tmp"
+    with open(tmp_bin_path, "wb") as f:
+        for template_path in template_paths:
+            scale_factor = common.get_template_scale_factor(template_path, width, height)
+            entry = {"scale": scale_factor}
+            for mode, grayscale in (("gray", True), ("color", False)):
+                try:
+                    template = np.ascontiguousarray(common._load_template(template_path, grayscale, scale_factor))
+                except Exception as e:
+                    logger.warning(f"Skipping {template_path} in template pack: {e}")
+                    break
+                padding = -offset % PACK_ALIGNMENT
+                f.write(b"\0" * padding)
+                offset += padding
+                f.write(template.tobytes())
+                entry[mode] = {"offset": offset, "shape": list(template.shape)}
+                offset += template.nbytes
+            else:
+                index["templates"][template_path] = entry
+
+    tmp_index_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_index_path, "w") as f:
+        json.dump(index, f)
+    # Binary first so a visible index always points at a complete pack
+    os.replace(tmp_bin_path, bin_path)
+    os.replace(tmp_index_path, index_path)
+    _remove_stale_packs(width, height, (bin_path, index_path))
+
+    logger.info(f"Built template pack for {width}x{height} with {len(index['templates'])} templates ({offset / 1e6:.1f} MB)")
+    return index_path
+
+class TemplatePack:
+    """Read-only view over a memory mapped template pack"""
+
+    def __init__(self, bin_path, index):
+        self.width = index["width"]
+        self.height = index["height"]
+        self.content_hash = index["hash"]
+        self._templates = index["templates"]
+        self._data = np.memmap(bin_path, dtype=np.uint8, mode="r")
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get(self, template_path, grayscale, scale_factor):
+        """Get the packed template or None when it isn't packed for this colour mode and scale"""
+        entry = self._templates.get(template_path)
+        if entry is None or entry["scale"] != scale_factor:
+            return None
+        layout = entry["gray" if grayscale else "color"]
+        shape = tuple(layout["shape"])
+        size = int(np.prod(shape))
+        return self._data[layout["offset"]:layout["offset"] + size].reshape(shape)
+
+def load_pack(width, height, build_if_stale=True):
+    """Load the pack for the resolution, rebuilding it when the pictures changed. Returns None on failure."""
+    try:
+        template_paths = list_template_paths()
+        content_hash = compute_content_hash(template_paths, width, height)
+        bin_path, index_path = _pack_paths(width, height, content_hash)
+
+        if not (os.path.exists(index_path) and os.path.exists(bin_path)):
+            if not build_if_stale:
+                return None
+            logger.info(f"Template pack for {width}x{height} missing or outdated, rebuilding")
+            build_pack(width, height, template_paths, content_hash)
+
+        with open(index_path, "r") as f:
+            index = json.load(f)
+        if index.get("version") != PACK_VERSION or index.get("hash") != content_hash:
+            logger.warning(f"Template pack index {index_path} does not match its content hash, ignoring it")
+            return None
+
+        pack = TemplatePack(bin_path, index)
+        logger.debug(f"Loaded template pack {os.path.basename(bin_path)} with {len(pack)} templates")
+        return pack
+    except Exception as e:
+        logger.warning(f"Could not load template pack for {width}x{height}: {e}")
+        return None
+
+if __name__ == "__main__":
+    sys.path.append(os.path.join(BASE_PATH, 'src'))
+    import common
+
+    if len(sys.argv) >= 3:
+        target_width, target_height = int(sys.argv[1]), int(sys.argv[2])
+    else:
+        target_width, target_height = common.get_monitor_resolution()
+
+    print(f"Building template pack for {target_width}x{target_height}...")
+    print(f"Written {build_pack(target_width, target_height)}")
@@ -28,46 +28,23 @@ class ConnectionManager:
     
     def __init__(self):
         """Initialize connection manager"""
-        self.connection_event = threading.Event()
-        self.connection_event.set()  # Start with connection assumed good
+        from common import get_connection_watchdog
+        
+        # Shared watchdog, its event is set while the connection is good
+        self.watchdog = get_connection_watchdog()
+        self.connection_event = self.watchdog.connected
     
     def start_connection_monitor(self):
         """Start the connection monitoring thread"""
         try:
-            connection_thread = threading.Thread(target=self._connection_check, daemon=True)
-            connection_thread.start()
+            self.watchdog.start()
         except RuntimeError as e:
             if "main thread is not in main loop" in str(e):
                 logger.warning("Cannot start connection monitor thread in subprocess, using polling instead")
-                self._connection_check_polling()
+                self.watchdog.check()
             else:
                 raise
     
-    def _connection_check(self):
-        """Monitor connection status"""
-        from common import element_exist
-        
-        while True:
-            try:
-                if element_exist("pictures/general/connection.png", quiet_failure=True):
-                    self.connection_event.clear()
-                else:
-                    self.connection_event.set()
-            except Exception as e:
-                logger.error(f"Error in connection check: {e}")
-    
-    def _connection_check_polling(self):
-        """Simplified connection check without threading"""
-        from common import element_exist
-        
-        try:
-            if element_exist("pictures/general/connection.png", quiet_failure=True):
-                self.connection_event.clear()
-            else:
-                self.connection_event.set()
-        except Exception as e:
-            logger.error(f"Error in connection check: {e}")
-    
     def handle_reconnection(self):
         """Handle reconnection when needed"""
         try:
@@ -134,6 +111,9 @@ def main(runs=None, difficulty=None, shared_vars=None):
         connection_manager = ConnectionManager()
         connection_manager.start_connection_monitor()
         
+        import vision_worker
+        vision_worker.start_if_enabled()
+        
         # First run with SelectTeam=True
         luxcavation_functions.pre_threads_setup(difficulty, SelectTeam=True, config_type="threads_team_selection")
         
@@ -172,6 +152,9 @@ def main(runs=None, difficulty=None, shared_vars=None):
     except Exception as e:
         logger.critical(f"Critical error in Threads runner: {e}")
         return 1
+    finally:
+        # Learned template regions gathered since the last periodic save
+        common.save_learned_regions(force=True)
 
 if __name__ == "__main__":
     try:
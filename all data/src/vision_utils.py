@@ -0,0 +1,99 @@
+"""
+Vision Utils - vectorised post-processing of template match score maps
+
+Turns a cv2.matchTemplate score map into match boxes without Python loops over
+pixels: points above threshold are kept only when no neighbour scores higher,
+the best peaks are kept with a partial sort and overlapping boxes are suppressed
+on whole arrays at once.
+
+Kept free of screen capture and input imports so it can be benchmarked and
+reused outside the bot (see benchmarks/bench_peak_extraction.py).
+"""
+import numpy as np
+
+# Offsets of the 3x3 neighbourhood a peak must dominate
+NEIGHBOUR_OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+
+def find_peaks(result, threshold, max_peaks=None):
+    """Find local maxima of a score map at or above threshold.
+
+    Args:
+        result: Score map from cv2.matchTemplate
+        threshold: Minimum score of a peak
+        max_peaks: Keep only the best max_peaks peaks, None keeps all
+
+    Returns:
+        (xs, ys, scores) arrays sorted by descending score
+    """
+    height, width = result.shape[:2]
+    # Flat indexes are several times faster to collect than 2D np.nonzero on large maps
+    indexes = np.flatnonzero(result.ravel() >= threshold)
+    ys, xs = np.divmod(indexes, width)
+    scores = result[ys, xs]
+
+    # Compare only the candidates with their neighbours instead of dilating the whole map
+    is_peak = np.ones(len(scores), dtype=bool)
+    for dy, dx in NEIGHBOUR_OFFSETS:
+        neighbours = result[np.clip(ys + dy, 0, height - 1), np.clip(xs + dx, 0, width - 1)]
+        is_peak &= scores >= neighbours
+    xs, ys, scores = xs[is_peak], ys[is_peak], scores[is_peak]
+
+    if max_peaks is not None and len(scores) > max_peaks:
+        best = np.argpartition(scores, -max_peaks)[-max_peaks:]
+        xs, ys, scores = xs[best], ys[best], scores[best]
+    order = np.argsort(-scores, kind="stable")
+    return xs[order], ys[order], scores[order]
+
+def nms_boxes(boxes, scores, overlap_thresh=0.5):
+    """Suppress boxes overlapping a better scoring box.
+
+    Overlap is the intersection divided by the area of the weaker box.
+
+    Args:
+        boxes: (N, 4) array of x1, y1, x2, y2
+        scores: (N,) array of scores
+
+    Returns:
+        Indexes of the kept boxes, best score first
+    """
+    if len(boxes) == 0:
+        return np.empty(0, np.intp)
+
+    boxes = boxes.astype(np.float32)
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    area = (x2 - x1 + 1) * (y2 - y1 + 1)
+    order = np.argsort(-scores, kind="stable")
+
+    # One iteration per kept box, each suppressing all remaining boxes it covers at once
+    keep = []
+    while len(order) > 0:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        w = np.maximum(0, np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]) + 1)
+        h = np.maximum(0, np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]) + 1)
+        order = rest[(w * h) / area[rest] <= overlap_thresh]
+    return np.array(keep, dtype=np.intp)
+
+def extract_boxes(result, threshold, template_width, template_height, max_matches=None, overlap_thresh=0.5):
+    """Turn a score map into non-overlapping match boxes.
+
+    Args:
+        max_matches: Keep only the best max_matches boxes, None keeps all
+
+    Returns:
+        (boxes, scores) where boxes is an (N, 4) int array of x1, y1, x2, y2 ordered by
+        descending bottom edge
+    """
+    xs, ys, scores = find_peaks(result, threshold)
+    if len(scores) == 0:
+        return np.empty((0, 4), dtype=int), scores
+
+    boxes = np.stack([xs, ys, xs + template_width, ys + template_height], axis=1)
+    keep = nms_boxes(boxes, scores, overlap_thresh)
+    if max_matches is not None:
+        keep = keep[:max_matches]
+    boxes, scores = boxes[keep], scores[keep]
+
+    # Callers pick found[0] expecting the lowest match on screen first
+    order = np.argsort(-boxes[:, 3], kind="stable")
+    return boxes[order].astype(int), scores[order]
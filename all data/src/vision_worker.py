@@ -0,0 +1,334 @@
+"""
+Vision Worker - template matching in a separate process
+
+The worker process owns capture and matching. Match requests are answered over a
+pair of queues, and frames the automation process asks for are published raw to
+shared memory so it never grabs the screen itself. Matching then runs on another
+core instead of competing with the control logic for the GIL.
+
+Opt-in: nothing changes until start_vision_worker() is called. While a worker
+runs, common.match_image, common.match_many and common.exists hand their work to
+it and common.get_frame reads its frames. Checks against a frame the caller
+already holds, like ScreenClassifier.classify and common.wait_for, still match in
+process on that frame. A worker that doesn't answer in time is stopped and
+everything happens in process again.
+
+The worker is a child of the automation process, so that process must not be
+daemonic; the GUI starts its runners accordingly.
+"""
+import time
+import queue
+import logging
+import threading
+import itertools
+import multiprocessing
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from multiprocessing import shared_memory
+import numpy as np
+import common
+import shared_vars
+
+logger = logging.getLogger(__name__)
+
+VISION_WORKER_ENABLED = False  # Start a vision worker from the runners
+VISION_REQUEST_TIMEOUT = 10.0  # Seconds to wait for the worker to answer a request, the worker is stopped after the first timeout
+PARENT_CHECK_INTERVAL = 1.0  # Seconds between checks that the automation process is still alive
+FRAME_SLOTS = 2  # Frames alternate between slots so a reader never sees one half written
+
+# Operations the worker answers, all but capture are common functions of the same name
+OPERATIONS = {"match_image", "match_many", "exists", "capture"}
+
+# Settings copied into the worker, its shared_vars would otherwise only reflect the config file
+SHARED_SETTINGS = ["game_monitor", "convert_images_to_grayscale", "x_offset", "y_offset"]
+
+# Header fields at the start of the shared memory block, all int64
+HEADER_SEQUENCE, HEADER_SLOT, HEADER_HEIGHT, HEADER_WIDTH, HEADER_CHANNELS, HEADER_GENERATION, HEADER_TIMESTAMP, HEADER_MONITOR = range(8)
+HEADER_BYTES = 64
+
+class SharedFrame:
+    """Frame exchange through one shared memory block.
+
+    The writer fills the slot readers aren't pointed at, then flips the header.
+    The header sequence is odd while it changes, so readers retry instead of
+    reading a frame that is being replaced.
+    """
+
+    def __init__(self, shm, slot_bytes):
+        self.shm = shm
+        self.slot_bytes = slot_bytes
+        self.header = np.ndarray((HEADER_BYTES // 8,), dtype=np.int64, buffer=shm.buf)
+
+    @staticmethod
+    def size(slot_bytes):
+        """Bytes of shared memory needed for frames up to slot_bytes"""
+        return HEADER_BYTES + FRAME_SLOTS * slot_bytes
+
+    def _slot(self, slot, height, width, channels):
+        """View of a frame slot as a BGRA or BGR image"""
+        offset = HEADER_BYTES + slot * self.slot_bytes
+        return np.ndarray((height, width, channels), dtype=np.uint8, buffer=self.shm.buf, offset=offset)
+
+    def publish(self, frame):
+        """Copy a frame into the free slot and make it the current one.
+        
+        The raw grab is published as it is, so the worker never converts the whole screen just to share it.
+        """
+        image = frame.pixels
+        height, width, channels = image.shape
+        if image.nbytes > self.slot_bytes:
+            logger.debug(f"Frame of {width}x{height} doesn't fit the shared memory, not published")
+            return False
+        slot = (int(self.header[HEADER_SLOT]) + 1) % FRAME_SLOTS
+        self._slot(slot, height, width, channels)[:] = image
+        self.header[HEADER_SEQUENCE] += 1
+        self.header[HEADER_SLOT] = slot
+        self.header[HEADER_HEIGHT] = height
+        self.header[HEADER_WIDTH] = width
+        self.header[HEADER_CHANNELS] = channels
+        self.header[HEADER_GENERATION] = frame.generation
+        self.header[HEADER_TIMESTAMP] = int(frame.timestamp * 1e9)
+        self.header[HEADER_MONITOR] = frame.monitor_index
+        self.header[HEADER_SEQUENCE] += 1
+        return True
+
+    def read(self, retries=10):
+        """Copy the current frame out of shared memory.
+
+        Returns:
+            common.Frame, or None if nothing was published yet or the writer kept replacing it
+        """
+        for _ in range(retries):
+            sequence = int(self.header[HEADER_SEQUENCE])
+            if sequence == 0:
+                return None
+            if sequence % 2:
+                time.sleep(0.001)
+                continue
+            slot, height, width, channels, generation, timestamp, monitor_index = (
+                int(value) for value in self.header[HEADER_SLOT:HEADER_MONITOR + 1])
+            image = self._slot(slot, height, width, channels).copy()
+            if int(self.header[HEADER_SEQUENCE]) == sequence:
+                if channels == 4:
+                    # Matches in this process convert only the regions they search, like on a local grab
+                    return common.Frame(None, generation, monitor_index, timestamp=timestamp / 1e9, bgra=image)
+                return common.Frame(image, generation, monitor_index, timestamp=timestamp / 1e9)
+        return None
+
+def _worker_main(requests, responses, shm_name, slot_bytes, settings):
+    """Entry point of the vision process, answers requests until it receives None or its parent is gone"""
+    for name, value in settings.items():
+        setattr(shared_vars, name, value)
+    common.detect_monitor_resolution()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    shared_frame = SharedFrame(shm, slot_bytes)
+    parent = multiprocessing.parent_process()
+    try:
+        while True:
+            try:
+                request = requests.get(timeout=PARENT_CHECK_INTERVAL)
+            except queue.Empty:
+                # A runner killed by the GUI can't stop its worker, so the worker stops with it
+                if parent is not None and not parent.is_alive():
+                    break
+                continue
+            if request is None:
+                break
+            request_id, operation, newer_than, settings, kwargs = request
+            try:
+                for name, value in settings.items():
+                    setattr(shared_vars, name, value)
+                # The automation process did input since newer_than, older frames don't show its outcome
+                frame = common.get_frame(newer_than=max(newer_than, kwargs.get("newer_than") or 0.0))
+                if operation == "capture":
+                    # Only frames the automation process asked for are published
+                    shared_frame.publish(frame)
+                    result = None
+                else:
+                    result = getattr(common, operation)(**kwargs)
+                responses.put((request_id, True, result))
+            except Exception as e:
+                responses.put((request_id, False, f"{type(e).__name__}: {e}"))
+    finally:
+        shared_frame.header = None
+        shm.close()
+
+class VisionWorker:
+    """Handle of a vision process, used from the automation process"""
+
+    def __init__(self):
+        self.process = None
+        self.shm = None
+        self.shared_frame = None
+        self._requests = None
+        self._responses = None
+        self._receiver = None
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._stop_lock = threading.Lock()
+        self.tripped = False
+
+    def start(self):
+        """Start the vision process sized for the game monitor"""
+        monitor = common.get_monitor_info()
+        slot_bytes = monitor["width"] * monitor["height"] * 4
+        self.shm = shared_memory.SharedMemory(create=True, size=SharedFrame.size(slot_bytes))
+        self.shared_frame = SharedFrame(self.shm, slot_bytes)
+        self.shared_frame.header[:] = 0
+        self._requests = multiprocessing.Queue()
+        self._responses = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=_worker_main,
+            args=(self._requests, self._responses, self.shm.name, slot_bytes, self._settings()),
+            name="vision_worker",
+            daemon=True
+        )
+        self.process.start()
+        self._receiver = threading.Thread(target=self._receive, name="vision_worker_receiver", daemon=True)
+        self._receiver.start()
+        logger.info(f"Vision worker started (pid {self.process.pid})")
+
+    def stop(self):
+        """Stop the vision process and release the shared memory"""
+        with self._stop_lock:
+            if self.process is None:
+                return
+            self._requests.put(None)
+            self.process.join(timeout=5.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self._responses.put(None)  # Ends the receiver thread
+            self._fail_pending(RuntimeError("Vision worker stopped"))
+            self.shared_frame.header = None
+            self.shm.close()
+            self.shm.unlink()
+            self.process = None
+            logger.info("Vision worker stopped")
+
+    def alive(self):
+        """Check if the vision process is running and still trusted with requests"""
+        return not self.tripped and self.process is not None and self.process.is_alive()
+
+    def _settings(self):
+        """Settings of this process the worker needs to match like it would"""
+        return {name: getattr(shared_vars, name) for name in SHARED_SETTINGS if hasattr(shared_vars, name)}
+
+    def submit(self, operation, **kwargs):
+        """Queue a request without waiting for it.
+
+        Returns:
+            Future resolving to the result of the common function named operation
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown vision operation {operation}")
+        if not self.alive():
+            raise RuntimeError("Vision worker isn't running")
+        request_id = next(self._ids)
+        future = Future()
+        future.request_id = request_id
+        with self._pending_lock:
+            self._pending[request_id] = future
+        self._requests.put((request_id, operation, common._last_input_time, self._settings(), kwargs))
+        return future
+
+    def call(self, operation, **kwargs):
+        """Run a request and wait for its result, stopping the worker if it doesn't answer in time"""
+        future = self.submit(operation, **kwargs)
+        try:
+            return future.result(timeout=VISION_REQUEST_TIMEOUT)
+        except FutureTimeoutError:
+            with self._pending_lock:
+                self._pending.pop(future.request_id, None)
+            self._trip(f"didn't answer {operation} within {VISION_REQUEST_TIMEOUT}s")
+            raise
+
+    def _trip(self, reason):
+        """Stop handing work to a worker that stopped answering, every later match happens in process"""
+        with self._pending_lock:
+            if self.tripped:
+                return
+            self.tripped = True
+        logger.warning(f"Vision worker {reason}, matching in process from now on")
+        common.set_vision_worker(None)
+        # Requests queued behind the stuck one would each wait for the full timeout
+        self._fail_pending(RuntimeError(f"Vision worker {reason}"))
+        threading.Thread(target=self.stop, name="vision_worker_stop", daemon=True).start()
+
+    def match_image(self, template_path, **kwargs):
+        """common.match_image in the vision process"""
+        return self.call("match_image", template_path=template_path, **kwargs)
+
+    def match_many(self, template_paths, **kwargs):
+        """common.match_many in the vision process"""
+        return self.call("match_many", template_paths=template_paths, **kwargs)
+
+    def exists(self, template_path, **kwargs):
+        """common.exists in the vision process"""
+        return self.call("exists", template_path=template_path, **kwargs)
+
+    def frame(self, newer_than=None):
+        """Get the latest frame of the worker, asking it for a capture when it's older than newer_than"""
+        frame = self.shared_frame.read()
+        newer_than = max(newer_than or 0.0, common._last_input_time)
+        if frame is None or frame.timestamp <= newer_than:
+            self.call("capture", newer_than=newer_than)
+            frame = self.shared_frame.read()
+        return frame
+
+    def _receive(self):
+        """Resolve the futures of answered requests"""
+        while True:
+            response = self._responses.get()
+            if response is None:
+                return
+            request_id, ok, result = response
+            with self._pending_lock:
+                future = self._pending.pop(request_id, None)
+            if future is None:
+                continue
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(f"Vision worker error: {result}"))
+
+    def _fail_pending(self, error):
+        """Fail every request still waiting for an answer"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(error)
+
+_vision_worker = None
+_vision_worker_lock = threading.Lock()
+
+def start_vision_worker():
+    """Start the shared vision worker and route common matching and capture through it.
+
+    Returns:
+        The VisionWorker, None in a daemonic process since those can't have children
+    """
+    global _vision_worker
+    if multiprocessing.current_process().daemon:
+        logger.warning("Can't start a vision worker from a daemonic process, matching in process")
+        return None
+    with _vision_worker_lock:
+        if _vision_worker is not None and _vision_worker.alive():
+            return _vision_worker
+        worker = VisionWorker()
+        worker.start()
+        common.set_vision_worker(worker)
+        _vision_worker = worker
+        return worker
+
+def start_if_enabled():
+    """Start the shared vision worker when VISION_WORKER_ENABLED is set"""
+    return start_vision_worker() if VISION_WORKER_ENABLED else None
+
+def stop_vision_worker():
+    """Stop the shared vision worker, matching happens in process again"""
+    global _vision_worker
+    with _vision_worker_lock:
+        if _vision_worker is not None:
+            common.set_vision_worker(None)
+            _vision_worker.stop()
+            _vision_worker = None
@@ -0,0 +1,105 @@
+"""
+Benchmark of match box extraction from template match score maps
+
+Compares the per-pixel np.where loop + non_max_suppression_fast that common used
+before with the vectorised vision_utils.extract_boxes on dense score maps at 1080p
+and 1440p, and checks both find the same matches.
+
+Usage: python benchmarks/bench_peak_extraction.py [repeats]
+"""
+import os
+import sys
+import timeit
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "all data", "src"))
+import vision_utils
+
+RESOLUTIONS = [(1920, 1080), (2560, 1440)]
+THRESHOLDS = [0.8, 0.7]
+ICON_SIZE = 48  # At 1080p, scaled with the resolution like real templates
+ICON_GRID = (12, 6)  # Columns and rows of icon copies on screen
+
+def legacy_non_max_suppression(boxes, overlapThresh=0.5):
+    """Copy of common.non_max_suppression_fast as it was before vectorisation"""
+    if len(boxes) == 0:
+        return []
+    if boxes.dtype.kind == "i":
+        boxes = boxes.astype("float")
+    pick = []
+    x1 = boxes[:, 0]
+    y1 = boxes[:, 1]
+    x2 = boxes[:, 2]
+    y2 = boxes[:, 3]
+    area = (x2 - x1 + 1) * (y2 - y1 + 1)
+    idxs = np.argsort(y2)
+    while len(idxs) > 0:
+        last = len(idxs) - 1
+        i = idxs[last]
+        pick.append(i)
+        xx1 = np.maximum(x1[i], x1[idxs[:last]])
+        yy1 = np.maximum(y1[i], y1[idxs[:last]])
+        xx2 = np.minimum(x2[i], x2[idxs[:last]])
+        yy2 = np.minimum(y2[i], y2[idxs[:last]])
+        w = np.maximum(0, xx2 - xx1 + 1)
+        h = np.maximum(0, yy2 - yy1 + 1)
+        overlap = (w * h) / area[idxs[:last]]
+        idxs = np.delete(idxs, np.concatenate(([last], np.where(overlap > overlapThresh)[0])))
+    return boxes[pick].astype("int")
+
+def legacy_extract_boxes(result, threshold, template_width, template_height):
+    """Box extraction as common._match_on_frame did it before vectorisation"""
+    locations = np.where(result >= threshold)
+    boxes = []
+    match_scores = []
+    for pt in zip(*locations[::-1]):
+        top_left = pt
+        bottom_right = (top_left[0] + template_width, top_left[1] + template_height)
+        boxes.append([top_left[0], top_left[1], bottom_right[0], bottom_right[1]])
+        match_scores.append(result[top_left[1], top_left[0]])
+    return legacy_non_max_suppression(np.array(boxes))
+
+def make_score_map(width, height, seed=0):
+    """Build a score map of a screen tiled with copies of one icon over a smooth background"""
+    rng = np.random.default_rng(seed)
+    icon_size = ICON_SIZE * height // 1080
+    screen = cv2.GaussianBlur(rng.integers(0, 255, (height, width), dtype=np.uint8), (0, 0), 6)
+    icon = cv2.GaussianBlur(rng.integers(0, 255, (icon_size, icon_size), dtype=np.uint8), (0, 0), 2)
+
+    columns, rows = ICON_GRID
+    for row in range(rows):
+        for column in range(columns):
+            x = (column + 0.5) * width // columns - icon_size // 2
+            y = (row + 0.5) * height // rows - icon_size // 2
+            screen[int(y):int(y) + icon_size, int(x):int(x) + icon_size] = icon
+
+    # Slight blur spreads every match into a wide blob of scores above threshold, like real screenshots
+    screen = cv2.GaussianBlur(screen, (0, 0), 1.5)
+    return cv2.matchTemplate(screen, icon, cv2.TM_CCOEFF_NORMED), icon_size
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'resolution':>10} {'threshold':>9} {'points':>8} {'matches':>7} {'legacy ms':>10} {'vector ms':>10} {'speed-up':>8}")
+    for width, height in RESOLUTIONS:
+        result, icon_size = make_score_map(width, height)
+        for threshold in THRESHOLDS:
+            legacy = legacy_extract_boxes(result, threshold, icon_size, icon_size)
+            boxes, _ = vision_utils.extract_boxes(result, threshold, icon_size, icon_size)
+            legacy_centers = sorted(((x1 + x2) // 2, (y1 + y2) // 2) for x1, y1, x2, y2 in legacy)
+            centers = sorted(((x1 + x2) // 2, (y1 + y2) // 2) for x1, y1, x2, y2 in boxes)
+            assert len(legacy_centers) == len(centers), "Match counts differ"
+            # The legacy loop keeps the bottom-most pixel of each blob, the new one the peak
+            assert all(abs(a[0] - b[0]) <= icon_size // 2 and abs(a[1] - b[1]) <= icon_size // 2
+                       for a, b in zip(legacy_centers, centers)), "Match positions differ"
+
+            legacy_time = min(timeit.repeat(lambda: legacy_extract_boxes(result, threshold, icon_size, icon_size),
+                                            number=1, repeat=repeats))
+            vector_time = min(timeit.repeat(lambda: vision_utils.extract_boxes(result, threshold, icon_size, icon_size),
+                                            number=1, repeat=repeats))
+            points = int(np.count_nonzero(result >= threshold))
+            print(f"{width}x{height:<5} {threshold:>9} {points:>8} {len(boxes):>7} "
+                  f"{legacy_time * 1000:>10.2f} {vector_time * 1000:>10.2f} {legacy_time / vector_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()